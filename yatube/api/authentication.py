@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.db.routers import read_primary_if_pinned
+
+
+class ReplicaPinJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, после которой запросы пользователя, недавно
+    писавшего в базу, читают из основной базы, как запросы с кукой
+    core.db.routers.PIN_COOKIE.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            read_primary_if_pinned(result[0])
+        return result
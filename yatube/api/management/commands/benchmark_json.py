@@ -0,0 +1,94 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from posts.models import Post
+from ...parsers import FastJSONParser
+from ...readers import get_reader
+from ...renderers import FastJSONRenderer
+from ...serializers import PostSerializer
+
+
+class Command(BaseCommand):
+    """Сравнивает скорость JSONRenderer/JSONParser и их версий на orjson."""
+
+    help = (
+        'Измеряет, сколько мегабайт в секунду рендерят и разбирают '
+        'стандартные JSON-рендерер и парсер DRF и их версии на orjson, '
+        'и проверяет, что результат совпадает.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=1000,
+            help='Сколько постов положить в ответ.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько проходов выполнить; берётся лучший.'
+        )
+
+    def measure(self, func, repeat):
+        """Возвращает результат func() и лучшее время из repeat."""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    def report(self, name, size, slow_time, fast_time):
+        megabytes = size / 1024 / 1024
+        self.stdout.write(
+            f'{name}, {size} байт\n'
+            f'  DRF:    {megabytes / slow_time:.1f} МБ/с\n'
+            f'  orjson: {megabytes / fast_time:.1f} МБ/с '
+            f'(в {slow_time / fast_time:.1f} раза быстрее)'
+        )
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/api/v1/posts/')
+        repeat = max(options['repeat'], 1)
+        reader = get_reader(PostSerializer)
+        data = {
+            'next': None,
+            'previous': None,
+            'results': reader.many(
+                reader.values(
+                    Post.objects.order_by('-id')[:options['limit']]
+                ),
+                request
+            ),
+        }
+        if not data['results']:
+            raise CommandError('Нет постов для замера')
+
+        slow, slow_time = self.measure(
+            lambda: JSONRenderer().render(data), repeat
+        )
+        fast, fast_time = self.measure(
+            lambda: FastJSONRenderer().render(data), repeat
+        )
+        if slow != fast:
+            raise CommandError('Рендеринг: JSON не совпадает')
+        self.report('Рендеринг', len(fast), slow_time, fast_time)
+
+        parsed, slow_time = self.measure(
+            lambda: JSONParser().parse(io.BytesIO(fast)), repeat
+        )
+        fast_parsed, fast_time = self.measure(
+            lambda: FastJSONParser().parse(io.BytesIO(fast)), repeat
+        )
+        if parsed != fast_parsed:
+            raise CommandError('Разбор: данные не совпадают')
+        self.report('Разбор', len(fast), slow_time, fast_time)
+        self.stdout.write(self.style.SUCCESS('Результат совпадает'))
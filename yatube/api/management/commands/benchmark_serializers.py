@@ -0,0 +1,83 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from posts.models import Comment, Post
+from ...readers import get_reader
+from ...serializers import CommentSerializer, PostSerializer
+
+
+class Command(BaseCommand):
+    """Сравнивает скорость сериализаторов API и ValuesReader."""
+
+    help = (
+        'Измеряет, сколько строк в секунду сериализуют PostSerializer и '
+        'CommentSerializer и их быстрые версии из .values(), и проверяет, '
+        'что JSON совпадает.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=1000,
+            help='Сколько строк сериализовать за один проход.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Сколько проходов выполнить; берётся лучший.'
+        )
+
+    def measure(self, func, repeat):
+        """Возвращает результат func() и лучшее время из repeat.
+        Каждый проход строит новый queryset, чтобы учитывать и чтение
+        из базы.
+        """
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/api/v1/posts/')
+        limit = options['limit']
+        repeat = max(options['repeat'], 1)
+        cases = (
+            (PostSerializer, Post.objects.select_related('author', 'group')),
+            (CommentSerializer, Comment.objects.select_related('author')),
+        )
+        for serializer_class, queryset in cases:
+            queryset = queryset.order_by('-id')[:limit]
+            reader = get_reader(serializer_class)
+            slow, slow_time = self.measure(
+                lambda: serializer_class(
+                    queryset.all(), many=True, context={'request': request}
+                ).data,
+                repeat
+            )
+            fast, fast_time = self.measure(
+                lambda: reader.many(reader.values(queryset), request),
+                repeat
+            )
+            if json.dumps(slow) != json.dumps(fast):
+                raise CommandError(
+                    f'{serializer_class.__name__}: JSON не совпадает'
+                )
+            rows = len(fast)
+            if not rows:
+                self.stdout.write(f'{serializer_class.__name__}: нет строк')
+                continue
+            self.stdout.write(
+                f'{serializer_class.__name__}, строк: {rows}\n'
+                f'  сериализатор: {rows / slow_time:.0f} строк/с\n'
+                f'  .values():    {rows / fast_time:.0f} строк/с '
+                f'(в {slow_time / fast_time:.1f} раза быстрее)'
+            )
+        self.stdout.write(self.style.SUCCESS('JSON совпадает'))
@@ -1,6 +1,14 @@
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework import mixins
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from core.cache import conditional_response
+from .readers import get_reader
+
 
 class FollowMixinViewSet(
     mixins.CreateModelMixin,
@@ -9,3 +17,161 @@ class FollowMixinViewSet(
 ):
     """Вьюсет предоставляет базовые `create()`, `list()` экшены."""
     pass
+
+
+class ListMixinViewSet(mixins.ListModelMixin, GenericViewSet):
+    """Вьюсет предоставляет базовый `list()` экшен."""
+    pass
+
+
+class ConditionalGetMixin:
+    """Добавляет `list()` и `retrieve()` заголовки ETag и Last-Modified.
+    Если ресурс не изменился, отвечает 304 без сериализации данных.
+    Области данных ответа вьюсет задаёт атрибутом scopes, а если они
+    зависят от запроса — методом get_scopes().
+    """
+    scopes = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if (
+            cls.scopes is None
+            and cls.get_scopes is ConditionalGetMixin.get_scopes
+        ):
+            raise ImproperlyConfigured(
+                f'Задайте scopes или get_scopes() во вьюсете {cls.__name__}'
+            )
+
+    def get_scopes(self):
+        return self.scopes
+
+    def get_kwarg_id(self, name):
+        """Возвращает id из параметра адреса name как int. Роутер
+        пропускает и `05`, и `+5`, а версии областей сбрасываются по id
+        поста в каноническом виде; нечисловой id — 404.
+        """
+        try:
+            return int(self.kwargs[name])
+        except (TypeError, ValueError):
+            raise NotFound()
+
+    def _conditional(self, action, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            self.get_scopes(),
+            lambda: action(request, *args, **kwargs),
+            vary_on=(request.accepted_renderer.format,)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """Поддерживает параметры запроса fields и expand при чтении.
+    fields — перечисленные через запятую поля ответа, expand — связи,
+    которые нужно встроить в ответ вместо их id. Параметры передаются
+    сериализатору в контексте, а plan_queryset() подгружает ровно те
+    связи, которые попадут в ответ: поля select_fields через
+    select_related(), встроенные связи — через get_prefetch().
+    """
+    select_fields = ()
+
+    def _query_list(self, name):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return ()
+        value = self.request.query_params.get(name, '')
+        return tuple(item.strip() for item in value.split(',') if item.strip())
+
+    def get_fields(self):
+        """Возвращает запрошенные поля; пустой tuple — все поля."""
+        return self._query_list('fields')
+
+    def get_expand(self):
+        """Возвращает запрошенные для встраивания связи, попадающие
+        в ответ.
+        """
+        fields = self.get_fields()
+        return tuple(
+            name for name in self._query_list('expand')
+            if not fields or name in fields
+        )
+
+    def get_prefetch(self, name):
+        """Возвращает Prefetch для встраиваемой связи name или None,
+        если связь подгружается через select_related() или не
+        поддерживается.
+        """
+        return None
+
+    def plan_queryset(self, queryset):
+        """Добавляет к queryset подгрузку связей, нужных для ответа."""
+        fields = self.get_fields()
+        select = [
+            name for name in self.select_fields
+            if not fields or name in fields
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        prefetches = [
+            prefetch for prefetch in map(self.get_prefetch, self.get_expand())
+            if prefetch is not None
+        ]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_fields()
+        context['expand'] = self.get_expand()
+        return context
+
+
+class ValuesReadMixin(SparseFieldsMixin):
+    """Быстрые `list()` и `retrieve()` без объектов моделей.
+    Строки читаются через .values() и сериализуются ValuesReader,
+    ответ совпадает с ответом сериализатора. Если в ответ встраиваются
+    связи или сериализатор нельзя прочитать из .values(), используется
+    обычный путь.
+    """
+
+    def get_reader(self):
+        if self.get_expand():
+            return None
+        return get_reader(self.get_serializer_class(), self.get_fields())
+
+    def _ordering_fields(self):
+        return tuple(
+            name.lstrip('-')
+            for name in getattr(self.paginator, 'ordering', ())
+        )
+
+    def list(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+        rows = reader.values(
+            self.filter_queryset(self.get_queryset()),
+            *self._ordering_fields()
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.many(page, request))
+        return Response(reader.many(rows, request))
+
+    def retrieve(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        if reader is None:
+            return super().retrieve(request, *args, **kwargs)
+        # Объект модели не создаётся, поэтому проверки прав на объект
+        # нет: для чтения её не требует ни одно разрешение API.
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            reader.values(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return Response(reader.to_representation(row, request))
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from core.utils import CursorPaginator
+
+
+class KeysetCursorPagination(BasePagination):
+    """Курсорная пагинация по составному ключу сортировки ordering.
+    Страница выбирается условием по ключу, а не OFFSET, поэтому глубокие
+    страницы стоят столько же, сколько первая, а новые объекты не сдвигают
+    уже выданные страницы. Размер страницы задаётся параметром limit.
+    """
+    ordering = ('-pub_date', '-id')
+    page_size = settings.ITEMS_PER_PAGE
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = CursorPaginator(
+            queryset, self.get_page_size(request), ordering=self.ordering
+        )
+        self.page = paginator.get_cursor_page(
+            request.query_params.get(self.cursor_query_param)
+        )
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.page.next_cursor)
+
+    def get_previous_link(self):
+        return self._link(self.page.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        link = {'type': 'string', 'nullable': True, 'format': 'uri'}
+        return {
+            'type': 'object',
+            'properties': {
+                'next': link,
+                'previous': link,
+                'results': schema,
+            },
+        }
+
+
+class PostCursorPagination(KeysetCursorPagination):
+    """Посты от новых к старым."""
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """Комментарии в порядке публикации."""
+    ordering = ('created', 'id')
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+from rest_framework import relations, serializers
+from rest_framework.settings import api_settings
+
+
+class ValuesReader:
+    """Быстрая сериализация для чтения из строк .values().
+    Поля сериализатора разбираются один раз: для каждого поля
+    запоминаются путь в .values() и функция преобразования значения.
+    Ответ совпадает с ответом сериализатора, но не требует создания
+    объектов моделей и дерева полей на каждый запрос.
+    Принимает обязательный serializer_class и необязательный
+    fields: tuple полей ответа; пустой tuple — все поля.
+    Поля, которые нельзя получить из .values() (вложенные
+    сериализаторы, вычисляемые поля), вызывают TypeError.
+    """
+
+    def __init__(self, serializer_class, fields=()):
+        self.columns = [
+            self._compile(name, field)
+            for name, field in serializer_class().fields.items()
+            if not field.write_only and (not fields or name in fields)
+        ]
+        self.lookups = tuple(dict.fromkeys(
+            lookup for _, lookup, _ in self.columns
+        ))
+
+    @staticmethod
+    def _compile(name, field):
+        if isinstance(field, (serializers.BaseSerializer,
+                              relations.ManyRelatedField)):
+            raise TypeError(f'Поле {name} нельзя прочитать из .values()')
+        if field.source == '*' or '.' in field.source:
+            raise TypeError(f'Поле {name} нельзя прочитать из .values()')
+        if isinstance(field, relations.SlugRelatedField):
+            return name, f'{field.source}__{field.slug_field}', None
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                return name, field.source, _plain(field.pk_field)
+            return name, field.source, None
+        if isinstance(field, relations.RelatedField):
+            raise TypeError(f'Поле {name} нельзя прочитать из .values()')
+        if isinstance(field, serializers.FileField):
+            storage = field.parent.Meta.model._meta.get_field(
+                field.source
+            ).storage
+            return name, field.source, _file_url(field, storage)
+        return name, field.source, _plain(field)
+
+    def values(self, queryset, *extra):
+        """Возвращает queryset.values() с полями ответа и extra."""
+        return queryset.values(*dict.fromkeys(self.lookups + extra))
+
+    def to_representation(self, row, request=None):
+        """Возвращает представление одной строки .values()."""
+        result = OrderedDict()
+        for name, lookup, convert in self.columns:
+            value = row[lookup]
+            if value is None or convert is None:
+                result[name] = value
+            else:
+                result[name] = convert(value, request)
+        return result
+
+    def many(self, rows, request=None):
+        """Возвращает список представлений строк."""
+        return [self.to_representation(row, request) for row in rows]
+
+
+def _plain(field):
+    to_representation = field.to_representation
+    return lambda value, request: to_representation(value)
+
+
+def _file_url(field, storage):
+    """Повторяет FileField.to_representation() для имени файла."""
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    def convert(value, request):
+        if not value:
+            return None
+        if not use_url:
+            return value
+        url = storage.url(value)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+@lru_cache(maxsize=128)
+def _get_reader(serializer_class, fields):
+    try:
+        return ValuesReader(serializer_class, fields)
+    except TypeError:
+        return None
+
+
+def get_reader(serializer_class, fields=()):
+    """Возвращает закешированный ValuesReader для сериализатора
+    и набора полей или None, если сериализатор нельзя прочитать
+    из .values().
+    """
+    return _get_reader(serializer_class, tuple(fields))
@@ -1,19 +1,110 @@
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 from rest_framework.validators import UniqueTogetherValidator
 
+from core.uploads import BoundedImageField
+from posts.bulk import create_posts
 from posts.models import Comment, Follow, Group, Post, User
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Связь по id, которая сначала ищет объект в словаре preloaded.
+    Пакетные сериализаторы заполняют его одним запросом in_bulk(),
+    чтобы не выполнять запрос на каждый элемент.
+    """
+    preloaded = None
+
+    def to_internal_value(self, data):
+        if self.preloaded is not None:
+            try:
+                return self.preloaded[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class PostListSerializer(serializers.ListSerializer):
+    """Пакетное создание постов.
+    Ошибочные элементы не мешают сохранить остальные: их ошибки
+    собираются в item_errors: dict {индекс элемента: ошибки}.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                'non_field_errors': ['Ожидается список постов.']
+            })
+        if len(data) > settings.API_BULK_MAX_ITEMS:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    'Можно создать не больше '
+                    f'{settings.API_BULK_MAX_ITEMS} постов за запрос.'
+                ]
+            })
+        group_field = self.child.fields['group']
+        group_field.preloaded = Group.objects.in_bulk([
+            item['group'] for item in data
+            if isinstance(item, dict) and isinstance(item.get('group'), int)
+        ])
+        self.item_errors = {}
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as error:
+                self.item_errors[index] = error.detail
+        return validated
+
+    def create(self, validated_data):
+        return create_posts([Post(**attrs) for attrs in validated_data])
+
+
+class SparseFieldsSerializerMixin:
+    """Оставляет в сериализаторе поля из context['fields'] и встраивает
+    связи из context['expand']. Встраиваемые поля описываются словарём
+    expandable_fields: dict {имя: callable, возвращающий поле}.
+    Вложенные сериализаторы получают контекст без этих ключей,
+    поэтому сами не урезаются.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in self.context.get('expand', ()):
+            if name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name]()
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class PostSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
+    group = PreloadedPrimaryKeyRelatedField(
+        queryset=Group.objects.all(),
+        required=False,
+        allow_null=True
+    )
+    image = serializers.ImageField(
+        required=False,
+        _DjangoImageField=BoundedImageField
+    )
+    expandable_fields = {
+        'group': lambda: GroupSerializer(read_only=True),
+        'comments': lambda: CommentSerializer(many=True, read_only=True),
+    }
 
     class Meta:
         fields = '__all__'
         model = Post
+        list_serializer_class = PostListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -33,7 +124,7 @@ class GroupSerializer(serializers.ModelSerializer):
 
 class FollowSerializer(serializers.ModelSerializer):
     following = serializers.SlugRelatedField(
-        queryset=User.objects.all(), slug_field='username'
+        queryset=User.objects.all(), slug_field='username', source='author'
     )
     user = serializers.SlugRelatedField(
         read_only=True,
@@ -49,7 +140,7 @@ class FollowSerializer(serializers.ModelSerializer):
         return value
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'user', 'following')
         model = Follow
         validators = [
             UniqueTogetherValidator(
@@ -57,3 +148,31 @@ class FollowSerializer(serializers.ModelSerializer):
                 fields=('user', 'following'),
             )
         ]
+
+
+class FollowBulkSerializer(serializers.Serializer):
+    """Списки логинов авторов для пакетной подписки и отписки."""
+    follow = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        default=list
+    )
+    unfollow = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        default=list
+    )
+
+    def validate(self, attrs):
+        if not attrs['follow'] and not attrs['unfollow']:
+            raise serializers.ValidationError(
+                'Передайте логины авторов в follow или unfollow.'
+            )
+        if len(attrs['follow']) + len(attrs['unfollow']) > (
+            settings.API_BULK_MAX_ITEMS
+        ):
+            raise serializers.ValidationError(
+                'Можно изменить не больше '
+                f'{settings.API_BULK_MAX_ITEMS} подписок за запрос.'
+            )
+        return attrs
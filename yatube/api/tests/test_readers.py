@@ -0,0 +1,76 @@
+import json
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from posts.models import Comment, Post
+from posts.tests.setup_data import (
+    create_comment, create_group, create_post, create_user,
+)
+from ..readers import get_reader
+from ..serializers import CommentSerializer, PostSerializer
+
+
+class ValuesReaderTest(TestCase):
+    """Тесты быстрой сериализации из строк .values()."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        group = create_group(1)
+        post = create_post(author=cls.user, group=group)
+        create_post(author=cls.user)
+        Post.objects.filter(pk=post.pk).update(image='posts/image.jpg')
+        create_comment(post=post, author=cls.user)
+
+    def setUp(self):
+        self.request = RequestFactory().get('/api/v1/posts/')
+
+    def assertSameJson(self, serializer_class, queryset, fields=()):
+        reader = get_reader(serializer_class, fields)
+        serializer = serializer_class(
+            queryset,
+            many=True,
+            context={'request': self.request, 'fields': fields}
+        )
+        self.assertEqual(
+            json.dumps(
+                reader.many(reader.values(queryset), self.request)
+            ),
+            json.dumps(serializer.data)
+        )
+
+    def test_same_output(self):
+        """Ответ совпадает с ответом сериализатора."""
+        cases = (
+            (PostSerializer, Post.objects.order_by('id'), ()),
+            (PostSerializer, Post.objects.order_by('id'), ('id', 'image')),
+            (CommentSerializer, Comment.objects.order_by('id'), ()),
+        )
+        for serializer_class, queryset, fields in cases:
+            with self.subTest(serializer=serializer_class, fields=fields):
+                self.assertSameJson(serializer_class, queryset, fields)
+
+    def test_reader_is_cached(self):
+        """Поля сериализатора разбираются один раз."""
+        self.assertIs(
+            get_reader(PostSerializer, ['id']),
+            get_reader(PostSerializer, ('id',))
+        )
+
+    def test_nested_fields_not_supported(self):
+        """Сериализатор с вложенными полями читается обычным путём."""
+        class NestedSerializer(PostSerializer):
+            comments = CommentSerializer(many=True, read_only=True)
+
+        self.assertIsNone(get_reader(NestedSerializer))
+
+    def test_benchmark_command(self):
+        """Бенчмарк сравнивает оба пути и проверяет совпадение JSON."""
+        out = StringIO()
+        call_command('benchmark_serializers', limit=10, repeat=1, stdout=out)
+        self.assertIn('PostSerializer, строк: 2', out.getvalue())
+        self.assertIn('JSON совпадает', out.getvalue())
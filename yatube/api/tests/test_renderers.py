@@ -0,0 +1,105 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from collections import OrderedDict
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from posts.tests.setup_data import create_post, create_user
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer
+
+DATA = OrderedDict([
+    ('id', 1),
+    ('text', 'Текст с \u2028разделителем\u2029строк'),
+    ('image', 'http://testserver/media/posts/image.jpg'),
+    ('pub_date', datetime.datetime(
+        2022, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc
+    )),
+    ('updated', datetime.datetime(
+        2022, 1, 2, 3, 4, 5,
+        tzinfo=datetime.timezone(datetime.timedelta(hours=3))
+    )),
+    ('naive', datetime.datetime(2022, 1, 2, 3, 4, 5)),
+    ('date', datetime.date(2022, 1, 2)),
+    ('rating', decimal.Decimal('4.50')),
+    ('uuid', uuid.UUID(int=1)),
+    ('lazy', gettext_lazy('Ошибка')),
+    ('errors', {1: ['Обязательное поле.']}),
+    ('group', None),
+    ('tags', ('a', 'b')),
+])
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """Тесты JSON-рендерера на orjson."""
+
+    def test_same_output(self):
+        """Вывод совпадает с JSONRenderer байт в байт."""
+        self.assertEqual(
+            FastJSONRenderer().render(DATA), JSONRenderer().render(DATA)
+        )
+
+    def test_indent(self):
+        """Запрошенные отступы обрабатываются как в JSONRenderer."""
+        for media_type in ('application/json; indent=4', None):
+            with self.subTest(media_type=media_type):
+                context = {} if media_type else {'indent': 2}
+                self.assertEqual(
+                    FastJSONRenderer().render(DATA, media_type, context),
+                    JSONRenderer().render(DATA, media_type, context)
+                )
+
+    def test_unsupported_data(self):
+        """Данные, которые не принимает orjson, рендерятся stdlib json."""
+        data = {'big': 2 ** 70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+
+class FastJSONParserTest(SimpleTestCase):
+    """Тесты JSON-парсера на orjson."""
+
+    def test_parse(self):
+        """Разбор совпадает с JSONParser."""
+        body = JSONRenderer().render({'text': 'Пост', 'group': 1})
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_parse_error(self):
+        """Некорректный JSON и NaN вызывают ParseError."""
+        for body in (b'{"text": ', b'{"value": NaN}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(body))
+
+    def test_other_encoding(self):
+        """Тела не в UTF-8 разбираются стандартным парсером."""
+        body = '{"text": "Пост"}'.encode('cp1251')
+        self.assertEqual(
+            FastJSONParser().parse(
+                io.BytesIO(body), parser_context={'encoding': 'cp1251'}
+            ),
+            {'text': 'Пост'}
+        )
+
+
+class BenchmarkJsonCommandTest(TestCase):
+    """Тест команды benchmark_json."""
+
+    def test_benchmark_command(self):
+        """Бенчмарк сравнивает рендереры и парсеры и проверяет результат."""
+        create_post(author=create_user(username='Author'))
+        out = io.StringIO()
+        call_command('benchmark_json', limit=10, repeat=1, stdout=out)
+        self.assertIn('Результат совпадает', out.getvalue())
@@ -0,0 +1,429 @@
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from posts.cache import POSTS_SCOPE
+from posts.models import Post
+from posts.search import search_posts
+from posts.tests.setup_data import (
+    create_comment, create_follow, create_group, create_post, create_user,
+)
+from ..mixins import ConditionalGetMixin
+
+
+class ApiQueriesTest(TestCase):
+    """Проверяет число запросов эндпоинтов API."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = create_group(1)
+        for number in range(5):
+            author = create_user(username=f'Author{number}')
+            post = create_post(author=author, group=cls.group)
+            create_comment(post=post, author=author)
+        cls.post = post
+
+    def test_posts_list_queries(self):
+        """Список постов загружается одним запросом."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_comments_list_queries(self):
+        """Список комментариев загружается одним запросом."""
+        with self.assertNumQueries(1):
+            self.client.get(
+                reverse('comments-list', args=(ApiQueriesTest.post.id,))
+            )
+
+    def test_posts_expand_queries(self):
+        """Встроенные группа и комментарии загружаются вместе с постами
+        двумя запросами на всю страницу.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('post-list') + '?expand=group,comments'
+            )
+        post = response.json()['results'][0]
+        self.assertEqual(post['group']['slug'], ApiQueriesTest.group.slug)
+        self.assertEqual(len(post['comments']), 1)
+        self.assertEqual(
+            post['comments'][0]['author'], ApiQueriesTest.post.author.username
+        )
+
+    def test_posts_sparse_fields(self):
+        """Параметр fields оставляет в ответе только указанные поля,
+        expand не добавляет связи, не вошедшие в fields.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('post-list') + '?fields=id,text&expand=comments'
+            )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0]['sql'])
+        for post in response.json()['results']:
+            self.assertEqual(set(post), {'id', 'text'})
+
+    def test_expand_ignored_on_write(self):
+        """При записи fields и expand не меняют сериализатор."""
+        client = APIClient()
+        client.force_authenticate(ApiQueriesTest.post.author)
+        response = client.post(
+            reverse('post-list') + '?fields=id&expand=group',
+            {'text': 'Новый пост', 'group': ApiQueriesTest.group.id}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['group'], ApiQueriesTest.group.id)
+        self.assertIn('text', response.json())
+
+
+class ApiCursorPaginationTest(TestCase):
+    """Проверяет курсорную пагинацию постов и комментариев."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        cls.posts = [create_post(author=cls.user) for _ in range(5)]
+        cls.comments = [
+            create_comment(post=cls.posts[0], author=cls.user)
+            for _ in range(5)
+        ]
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def walk(self, url):
+        """Проходит все страницы по ссылкам next и возвращает id."""
+        ids = []
+        while url:
+            data = self.client.get(url).json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+            create_post(author=ApiCursorPaginationTest.user)
+        return ids
+
+    def test_posts_stable_under_inserts(self):
+        """Новые посты не сдвигают страницы: ничего не теряется
+        и не повторяется, посты идут от новых к старым.
+        """
+        ids = self.walk(reverse('post-list') + '?limit=2')
+        self.assertEqual(
+            ids, [post.id for post in reversed(ApiCursorPaginationTest.posts)]
+        )
+
+    def test_comments_in_order(self):
+        """Комментарии идут от старых к новым, previous ведёт назад."""
+        url = reverse(
+            'comments-list', args=(ApiCursorPaginationTest.posts[0].id,)
+        )
+        self.assertEqual(
+            self.walk(url + '?limit=2'),
+            [comment.id for comment in ApiCursorPaginationTest.comments]
+        )
+        second = self.client.get(
+            self.client.get(url + '?limit=2').json()['next']
+        ).json()
+        first = self.client.get(second['previous']).json()
+        self.assertEqual(
+            [item['id'] for item in first['results']],
+            [comment.id for comment in ApiCursorPaginationTest.comments[:2]]
+        )
+        self.assertIsNone(first['previous'])
+
+
+class ApiConditionalGetTest(TestCase):
+    """Проверяет условные GET-запросы к постам и комментариям."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        cls.post = create_post(author=cls.user)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def test_not_modified_without_queries(self):
+        """Неизменившийся ресурс отдаёт 304 без запросов к базе."""
+        urls = (
+            reverse('post-list'),
+            reverse('post-detail', args=(self.post.id,)),
+            reverse('comments-list', args=(self.post.id,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_modified_after_comment(self):
+        """Новый комментарий меняет ETag поста и списков."""
+        urls = (
+            reverse('post-list'),
+            reverse('post-detail', args=(self.post.id,)),
+            reverse('comments-list', args=(self.post.id,)),
+        )
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        create_comment(post=self.post, author=self.user)
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_modified_after_group_change(self):
+        """Переименование группы меняет ETag поста с этой группой."""
+        group = create_group(1)
+        post = create_post(author=self.user, group=group)
+        url = reverse('post-detail', args=(post.id,)) + '?expand=group'
+        etag = self.client.get(url)['ETag']
+        group.title = 'Новое название'
+        group.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['group']['title'], 'Новое название')
+
+    def test_non_canonical_ids(self):
+        """Id поста вида `05` и `+5` получают ту же область, что и `5`:
+        новый комментарий меняет ETag поста и списка комментариев.
+        """
+        post = ApiConditionalGetTest.post
+        for url in (
+            f'/api/v1/posts/0{post.id}/',
+            f'/api/v1/posts/+{post.id}/',
+            f'/api/v1/posts/0{post.id}/comments/',
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                create_comment(post, self.user)
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/v1/posts/abc/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_scopes_required(self):
+        """Вьюсет без областей данных не определяется, а области
+        из атрибута scopes возвращает get_scopes().
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            type('NoScopesViewSet', (ConditionalGetMixin,), {})
+        viewset = type(
+            'PostsViewSet', (ConditionalGetMixin,), {'scopes': (POSTS_SCOPE,)}
+        )
+        self.assertEqual(viewset().get_scopes(), (POSTS_SCOPE,))
+
+
+class ApiBulkCreateTest(TestCase):
+    """Проверяет пакетное создание постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        cls.follower = create_user(username='Follower')
+        create_follow(follower=cls.follower, author=cls.user)
+        cls.group = create_group(1)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(ApiBulkCreateTest.user)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def bulk_create(self, items):
+        return self.client.post(
+            reverse('post-bulk'), data=items, format='json'
+        )
+
+    def test_valid_items_created_despite_errors(self):
+        """Валидные посты создаются, ошибки возвращаются по индексам,
+        побочные эффекты сохранения выполняются для всех постов.
+        """
+        group_id = ApiBulkCreateTest.group.id
+        response = self.bulk_create([
+            {'text': 'Первый пакетный пост', 'group': group_id},
+            {'text': ''},
+            {'text': 'Второй пакетный пост', 'group': 999},
+            {'text': 'Третий пакетный пост'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(
+            [post['text'] for post in data['created']],
+            ['Первый пакетный пост', 'Третий пакетный пост']
+        )
+        self.assertEqual(
+            [error['index'] for error in data['errors']], [1, 2]
+        )
+        created_ids = [post['id'] for post in data['created']]
+        self.assertEqual(
+            set(Post.objects.values_list('id', flat=True)), set(created_ids)
+        )
+        self.assertEqual(data['created'][0]['group'], group_id)
+        self.assertEqual(
+            set(ApiBulkCreateTest.follower.feed.values_list(
+                'post_id', flat=True
+            )),
+            set(created_ids)
+        )
+        ApiBulkCreateTest.user.profile.refresh_from_db()
+        self.assertEqual(ApiBulkCreateTest.user.profile.posts_count, 2)
+        self.assertEqual(search_posts('пакетный').count(), 2)
+
+    def test_queries_do_not_grow_with_items(self):
+        """Число запросов не зависит от количества постов."""
+        group_id = ApiBulkCreateTest.group.id
+
+        def items(count):
+            return [
+                {'text': f'Пост {number}', 'group': group_id}
+                for number in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as few:
+            self.bulk_create(items(2))
+        with CaptureQueriesContext(connection) as many:
+            self.bulk_create(items(20))
+        self.assertEqual(len(few), len(many))
+
+    def test_invalid_payload(self):
+        """Без валидных постов и для не списка возвращается 400."""
+        self.assertEqual(self.bulk_create([{'text': ''}]).status_code, 400)
+        self.assertEqual(
+            self.bulk_create({'text': 'не список'}).status_code, 400
+        )
+        self.client.force_authenticate(None)
+        self.assertEqual(
+            self.bulk_create([{'text': 'Аноним'}]).status_code, 401
+        )
+
+
+class ApiBulkFollowTest(TestCase):
+    """Проверяет пакетную подписку и отписку."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Reader')
+        cls.authors = [
+            create_user(username=f'Author{number}') for number in range(30)
+        ]
+        for author in cls.authors:
+            create_post(author=author)
+        create_follow(follower=cls.user, author=cls.authors[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(ApiBulkFollowTest.user)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def bulk(self, data):
+        return self.client.post(
+            reverse('follow-bulk'), data=data, format='json'
+        )
+
+    def test_bulk_follow(self):
+        """Подписки создаются пакетно, ошибки возвращаются по логинам,
+        ленты пополняются постами новых авторов.
+        """
+        usernames = [author.username for author in ApiBulkFollowTest.authors]
+        response = self.bulk({
+            'follow': usernames + ['Reader', 'Nobody'],
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['followed']), 29)
+        self.assertEqual(data['already_following'], ['Author0'])
+        self.assertEqual(set(data['errors']), {'Reader', 'Nobody'})
+        user = ApiBulkFollowTest.user
+        self.assertEqual(user.follower.count(), 30)
+        self.assertEqual(user.feed.count(), 30)
+
+    def test_queries_do_not_grow_with_authors(self):
+        """Число запросов не зависит от количества авторов."""
+        usernames = [author.username for author in ApiBulkFollowTest.authors]
+        with CaptureQueriesContext(connection) as few:
+            self.bulk({'follow': usernames[1:3]})
+        with CaptureQueriesContext(connection) as many:
+            self.bulk({'follow': usernames[3:]})
+        self.assertEqual(len(few), len(many))
+        with CaptureQueriesContext(connection) as few:
+            self.bulk({'unfollow': usernames[1:3]})
+        with CaptureQueriesContext(connection) as many:
+            self.bulk({'unfollow': usernames[3:]})
+        self.assertEqual(len(few), len(many))
+
+    def test_bulk_unfollow(self):
+        """Отписка удаляет подписки и посты авторов из ленты."""
+        user = ApiBulkFollowTest.user
+        self.bulk({'follow': ['Author1', 'Author2']})
+        response = self.bulk({'unfollow': ['Author0', 'Author1', 'Author5']})
+        data = response.json()
+        self.assertEqual(data['unfollowed'], ['Author0', 'Author1'])
+        self.assertEqual(list(data['errors']), ['Author5'])
+        self.assertEqual(
+            list(user.follower.values_list('author__username', flat=True)),
+            ['Author2']
+        )
+        self.assertEqual(
+            set(user.feed.values_list('author__username', flat=True)),
+            {'Author2'}
+        )
+
+    def test_follow_list(self):
+        """Список подписок выводит логины авторов."""
+        response = self.client.get(reverse('follow-list'))
+        self.assertEqual(
+            [follow['following'] for follow in response.json()], ['Author0']
+        )
+
+
+class ApiExportTest(TestCase):
+    """Проверяет потоковую выгрузку в NDJSON."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = create_user(username='Admin')
+        cls.admin.is_staff = True
+        cls.admin.save()
+        cls.post = create_post(author=cls.admin)
+        create_comment(post=cls.post, author=cls.admin)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(ApiExportTest.admin)
+
+    def test_export_stream(self):
+        """Выгрузка отдаётся потоком NDJSON выбранных типов."""
+        response = self.client.get(reverse('export') + '?type=post,comment')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)['type'] for line in lines], ['post', 'comment']
+        )
+
+    def test_export_errors(self):
+        """Выгрузка доступна только персоналу и знает типы записей."""
+        response = self.client.get(reverse('export') + '?type=user')
+        self.assertEqual(response.status_code, 400)
+        client = APIClient()
+        client.force_authenticate(create_user(username='User'))
+        self.assertEqual(client.get(reverse('export')).status_code, 403)
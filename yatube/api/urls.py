@@ -5,7 +5,10 @@ from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 
-from .views import CommentViewSet, FollowViewSet, GroupViewSet, PostViewSet
+from .views import (
+    CommentViewSet, ExportView, FollowViewSet, GroupViewSet, PostViewSet,
+    SearchViewSet,
+)
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -26,10 +29,12 @@ router_v1.register(
     basename='comments'
 )
 router_v1.register(r'follow', FollowViewSet, basename='follow')
+router_v1.register(r'search', SearchViewSet, basename='search')
 
 urlpatterns = [
     path('v1/', include('djoser.urls')),
     path('v1/', include('djoser.urls.jwt')),
+    path('v1/export/', ExportView.as_view(), name='export'),
     path('v1/', include(router_v1.urls)),
     re_path(
         r'^swagger(?P<format>\.json|\.yaml)$',
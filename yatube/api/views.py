@@ -1,38 +1,138 @@
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import filters
+from rest_framework import filters, status
+from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import (
+    IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly,
+)
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
+from core.uploads import accept_image_uploads
+from posts.bulk import follow_authors, unfollow_authors
+from posts.cache import COMMENTS_SCOPE, GROUPS_SCOPE, POSTS_SCOPE, post_scope
+from posts.export import EXPORTS, export_ndjson
 from posts.models import Comment, Group, Post
-from .mixins import FollowMixinViewSet
+from posts.search import search_posts
+from posts.thumbnails import schedule_thumbnails
+from .mixins import (
+    ConditionalGetMixin, FollowMixinViewSet, ListMixinViewSet,
+    SparseFieldsMixin, ValuesReadMixin,
+)
+from .pagination import CommentCursorPagination, PostCursorPagination
 from .permissions import AuthorOrReadOnly
 from .serializers import (
-    CommentSerializer, FollowSerializer, GroupSerializer, PostSerializer,
+    CommentSerializer, FollowBulkSerializer, FollowSerializer, GroupSerializer,
+    PostSerializer,
 )
 
 
-class PostViewSet(ModelViewSet):
+class PostsPlanMixin(SparseFieldsMixin):
+    """Подгрузка связей для выдачи постов: автор и группа одним
+    запросом с постами, комментарии при expand=comments — одним
+    дополнительным запросом на всю страницу.
+    """
+    select_fields = ('author', 'group')
+
+    def get_prefetch(self, name):
+        if name == 'comments':
+            return Prefetch(
+                'comments',
+                queryset=Comment.objects.select_related(
+                    'author'
+                ).order_by('created', 'id')
+            )
+        return None
+
+
+class PostViewSet(PostsPlanMixin, ConditionalGetMixin, ValuesReadMixin,
+                  ModelViewSet):
     """Перечисление или получение постов.
-    При указании параметров limit: int и offset: int
-    выдача производится с пагинацией.
+    Выдача постраничная по курсору: ссылки на соседние страницы
+    в полях next и previous, размер страницы задаёт параметр limit: int.
+    Параметр fields: str оставляет в ответе перечисленные через запятую
+    поля, параметр expand: str встраивает связи group и comments.
     """
     queryset = Post.objects.all()
     serializer_class = PostSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = PostCursorPagination
     permission_classes = (AuthorOrReadOnly,)
 
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
+
+    def initial(self, request, *args, **kwargs):
+        if self.action in ('create', 'update', 'partial_update'):
+            accept_image_uploads(request)
+        super().initial(request, *args, **kwargs)
+
+    def get_scopes(self):
+        if self.kwargs.get('pk') is None:
+            return (POSTS_SCOPE, COMMENTS_SCOPE)
+        scopes = [post_scope(self.get_kwarg_id('pk'))]
+        # Группа выводится slug'ом или целиком (expand=group), а её
+        # изменение не меняет версию поста.
+        fields = self.get_fields()
+        if not fields or 'group' in fields:
+            scopes.append(GROUPS_SCOPE)
+        return scopes
+
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        schedule_thumbnails(post)
+
+    def perform_update(self, serializer):
+        post = serializer.save()
+        if 'image' in serializer.validated_data:
+            schedule_thumbnails(post)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=(IsAuthenticated,)
+    )
+    def bulk(self, request):
+        """Создаёт посты из списка одной транзакцией.
+        Возвращает созданные посты и ошибки по индексам элементов;
+        ошибочные элементы не мешают сохранить остальные.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(author=request.user)
+        errors = [
+            {'index': index, 'errors': item_errors}
+            for index, item_errors in serializer.item_errors.items()
+        ]
+        return Response(
+            {'created': serializer.data, 'errors': errors},
+            status=(
+                status.HTTP_201_CREATED if serializer.instance
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
 
 
-class CommentViewSet(ModelViewSet):
-    """Перечисление или получение комментариев на пост."""
+class CommentViewSet(ConditionalGetMixin, ValuesReadMixin, ModelViewSet):
+    """Перечисление или получение комментариев на пост.
+    Выдача постраничная по курсору, от старых комментариев к новым.
+    Параметр fields: str оставляет в ответе перечисленные через запятую
+    поля.
+    """
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
     permission_classes = (AuthorOrReadOnly,)
+    select_fields = ('author',)
 
     def get_queryset(self):
-        return Comment.objects.filter(post__id=self.kwargs.get('post_id'))
+        return self.plan_queryset(
+            Comment.objects.filter(post__id=self.kwargs.get('post_id'))
+        )
+
+    def get_scopes(self):
+        return (post_scope(self.get_kwarg_id('post_id')),)
 
     def perform_create(self, serializer):
         serializer.save(
@@ -53,10 +153,81 @@ class FollowViewSet(FollowMixinViewSet):
     """Перечисление или получение всех подписок пользователя."""
     serializer_class = FollowSerializer
     filter_backends = (filters.SearchFilter,)
-    search_fields = ('following__username',)
+    search_fields = ('author__username',)
 
     def get_queryset(self):
-        return self.request.user.follower.all()
+        return self.request.user.follower.select_related('user', 'author')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Подписывает на авторов из списка follow и отписывает
+        от авторов из списка unfollow. Возвращает изменённые подписки
+        и ошибки по логинам; ошибки не мешают обработать остальных.
+        """
+        serializer = FollowBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = {
+            'followed': [],
+            'already_following': [],
+            'unfollowed': [],
+            'errors': {},
+        }
+        for usernames, change in (
+            (serializer.validated_data['follow'], follow_authors),
+            (serializer.validated_data['unfollow'], unfollow_authors),
+        ):
+            if usernames:
+                changes = change(request.user, usernames)
+                result['errors'].update(changes.pop('errors'))
+                result.update(changes)
+        return Response(result)
+
+
+class SearchViewSet(PostsPlanMixin, ListMixinViewSet):
+    """Поиск постов по тексту и комментариям.
+    Строка поиска передаётся в параметре q: str, посты выдаются
+    по убыванию релевантности. При указании параметров limit: int
+    и offset: int выдача производится с пагинацией. Параметры fields
+    и expand работают так же, как в выдаче постов.
+    """
+    serializer_class = PostSerializer
+    pagination_class = LimitOffsetPagination
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get_queryset(self):
+        return search_posts(
+            self.request.query_params.get('q', ''),
+            self.plan_queryset(Post.objects.all())
+        )
+
+
+class ExportView(APIView):
+    """Выгрузка постов, комментариев и подписок в NDJSON.
+    Параметр type: str задаёт через запятую типы записей (post,
+    comment, follow), по умолчанию выгружаются все. Ответ отдаётся
+    потоком, поэтому память сервера не зависит от размера таблиц.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        kinds = [
+            kind.strip()
+            for kind in request.query_params.get('type', '').split(',')
+            if kind.strip()
+        ] or list(EXPORTS)
+        unknown = [kind for kind in kinds if kind not in EXPORTS]
+        if unknown:
+            return Response(
+                {'type': [f'Неизвестный тип записей: {", ".join(unknown)}']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        response = StreamingHttpResponse(
+            export_ndjson(kinds), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="yatube-export.ndjson"'
+        )
+        return response
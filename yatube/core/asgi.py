@@ -0,0 +1,207 @@
+import asyncio
+import io
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Столько байт тела запроса читается до запуска приложения, чтобы
+# медленный клиент не занимал поток пула. Остаток приложение читает
+# само, и обработчики загрузки могут отклонить файл, не принимая его.
+MAX_MEMORY_BODY_SIZE = 1024 * 1024
+
+
+class ClientDisconnected(OSError):
+    """Клиент разорвал соединение, не передав тело запроса."""
+
+
+class RequestBody(io.RawIOBase):
+    """wsgi.input для потока пула: сначала отдаёт начало тела,
+    прочитанное до запуска приложения, затем получает остальные части
+    через receive() в цикле событий. Если клиент отключился, чтение
+    бросает ClientDisconnected, которое Django превращает
+    в UnreadablePostError.
+    """
+
+    def __init__(self, head, more_body, receive, loop):
+        self._chunk = memoryview(head)
+        self._more_body = more_body
+        self._receive = receive
+        self._loop = loop
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk and self._more_body:
+            message = asyncio.run_coroutine_threadsafe(
+                self._receive(), self._loop
+            ).result()
+            if message['type'] == 'http.disconnect':
+                self._more_body = False
+                raise ClientDisconnected('Клиент разорвал соединение')
+            self._chunk = memoryview(message.get('body', b''))
+            self._more_body = message.get('more_body', False)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+class WSGIThreadPoolApplication:
+    """ASGI-приложение, которое выполняет WSGI-приложение в пуле потоков.
+    В Django 2.2 нет ни ASGI-обработчика, ни асинхронных представлений,
+    поэтому представления по-прежнему синхронные, но медленный запрос
+    к базе занимает один поток пула, а не весь процесс: соединения,
+    медленных клиентов и keep-alive обслуживает цикл событий сервера.
+    Принимает обязательные application: WSGI-приложение и
+    max_workers: int размер пула — сколько запросов процесс выполняет
+    одновременно. У каждого потока своё соединение с базой.
+    """
+
+    def __init__(self, application, max_workers):
+        self.application = application
+        self.max_workers = max_workers
+        self.executor = None
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix='asgi'
+            )
+        return self.executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(
+                f'Тип соединения {scope["type"]} не поддерживается'
+            )
+        head = await self.read_head(receive)
+        if head is None:
+            return
+        loop = asyncio.get_running_loop()
+        body = io.BufferedReader(RequestBody(*head, receive, loop))
+
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        try:
+            await loop.run_in_executor(
+                self._get_executor(), self.run_wsgi, scope, body, send_sync
+            )
+        finally:
+            body.close()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._get_executor()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.executor is not None:
+                    self.executor.shutdown(wait=True)
+                    self.executor = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_head(self, receive):
+        """Читает тело запроса, пока оно не кончится или не наберётся
+        MAX_MEMORY_BODY_SIZE байт. Возвращает (прочитанное, more_body)
+        или None, если клиент отключился: тогда приложение не
+        запускается с обрезанным телом.
+        """
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body and size < MAX_MEMORY_BODY_SIZE:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunk = message.get('body', b'')
+            chunks.append(chunk)
+            size += len(chunk)
+            more_body = message.get('more_body', False)
+        return b''.join(chunks), more_body
+
+    def build_environ(self, scope, body):
+        """Возвращает WSGI environ для HTTP-соединения scope."""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode().decode(
+                'latin1'
+            ),
+            'PATH_INFO': scope['path'].encode().decode('latin1'),
+            'QUERY_STRING': scope['query_string'].decode('ascii'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f'HTTP/{scope["http_version"]}',
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin1').upper().replace('-', '_')
+            value = value.decode('latin1')
+            if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = name
+            else:
+                key = f'HTTP_{name}'
+            if key in environ:
+                value = f'{environ[key]},{value}'
+            environ[key] = value
+        return environ
+
+    def run_wsgi(self, scope, body, send):
+        """Выполняет WSGI-приложение в потоке пула и отправляет ответ
+        частями по мере того, как приложение их отдаёт.
+        """
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        def send_start():
+            if not response.get('sent'):
+                response['sent'] = True
+                send({
+                    'type': 'http.response.start',
+                    'status': response['status'],
+                    'headers': response['headers'],
+                })
+
+        result = self.application(
+            self.build_environ(scope, body), start_response
+        )
+        try:
+            for chunk in result:
+                if chunk:
+                    send_start()
+                    send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+        finally:
+            # close() отправляет сигнал request_finished: Django
+            # возвращает соединения с базой этого потока.
+            if hasattr(result, 'close'):
+                result.close()
+        send_start()
+        send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1,142 @@
+import hashlib
+import math
+import time
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_page
+
+from .db.routers import read_fresh
+
+VERSION_KEY_PREFIX = 'page_version'
+
+
+def _version_key(scope):
+    # Области содержат slug и username, хешируем их, чтобы ключ
+    # подходил для любого бэкенда кеша.
+    return f'{VERSION_KEY_PREFIX}:{hashlib.md5(scope.encode()).hexdigest()}'
+
+
+def _now():
+    """Версия — время изменения в микросекундах: её можно сравнивать
+    и использовать как дату последнего изменения.
+    """
+    return int(time.time() * 1_000_000)
+
+
+def get_versions(scopes):
+    """Возвращает словарь {область: версия} для переданных областей.
+    Области без версии получают версию `сейчас`; add() гарантирует,
+    что все процессы увидят одно и то же значение.
+    Версии хранятся settings.CACHE_VERSIONS_TIMEOUT секунд (None —
+    без срока): в кеше отдельного процесса устаревшая версия иначе
+    жила бы вечно.
+    """
+    keys = {_version_key(scope): scope for scope in scopes}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, _now(), settings.CACHE_VERSIONS_TIMEOUT)
+        versions[key] = cache.get(key, 0)
+    return {scope: versions[key] for key, scope in keys.items()}
+
+
+def bump_versions(*scopes):
+    """Меняет версии областей, делая устаревшими все страницы,
+    закешированные с этими областями.
+    """
+    now = _now()
+    cache.set_many(
+        {_version_key(scope): now for scope in scopes},
+        settings.CACHE_VERSIONS_TIMEOUT
+    )
+
+
+def versioned_cache_page(timeout, scopes):
+    """Декоратор кеширования страницы с версионированным ключом.
+    Принимает обязательные timeout: int время жизни страницы и
+    scopes: callable, который по аргументам представления возвращает
+    области данных страницы. Ключ кеша включает версии этих областей,
+    поэтому после bump_versions() страница сразу строится заново.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            versions = get_versions(scopes(*args, **kwargs))
+            key_prefix = hashlib.md5(
+                repr(sorted(versions.items())).encode()
+            ).hexdigest()
+            cached_view = cache_page(timeout, key_prefix=key_prefix)(view)
+            with read_fresh(versions):
+                return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def conditional_response(request, scopes, get_response, vary_on=(),
+                         use_last_modified=True):
+    """Отвечает на условный GET-запрос по версиям областей данных.
+    Принимает обязательные объект request, scopes: iterable областей,
+    от которых зависит ответ, и get_response: callable, строящий ответ.
+    Необязательный аргумент vary_on: tuple добавляет в ETag значения,
+    от которых ещё зависит представление (пользователь, формат).
+    При use_last_modified=False ответ строится без Last-Modified
+    и If-Modified-Since не учитывается: дата не отражает vary_on.
+    Версия области — время последнего изменения её данных, поэтому
+    неизменившийся ресурс получает 304 без вызова get_response().
+    Ответ на недавно изменившиеся данные строится по основной базе.
+    """
+    versions = get_versions(scopes)
+    etag = quote_etag(hashlib.md5(
+        repr((sorted(versions.items()), tuple(vary_on))).encode()
+    ).hexdigest())
+    last_modified = (
+        math.ceil(max(versions.values()) / 1_000_000)
+        if use_last_modified else None
+    )
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        with read_fresh(versions):
+            response = get_response()
+        if response.status_code == 200:
+            response.setdefault('ETag', etag)
+            if last_modified is not None:
+                response.setdefault(
+                    'Last-Modified', http_date(last_modified)
+                )
+    return response
+
+
+def versioned_condition(scopes):
+    """Декоратор условных GET-запросов для страниц сайта.
+    Принимает обязательный scopes: callable, который по аргументам
+    представления возвращает области данных страницы. Страница зависит
+    от пользователя (меню, кнопки подписки), а форма комментария — от
+    CSRF-токена, который меняется при входе. Поэтому в ETag входят
+    пользователь, ключ сессии и кука CSRF, а Last-Modified получают
+    только страницы для анонимных посетителей: дата не различает
+    пользователей.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            return conditional_response(
+                request,
+                scopes(*args, **kwargs),
+                lambda: view(request, *args, **kwargs),
+                vary_on=(
+                    request.user.pk,
+                    request.session.session_key,
+                    request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+                ),
+                use_last_modified=not request.user.is_authenticated,
+            )
+        return wrapper
+    return decorator
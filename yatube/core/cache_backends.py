@@ -0,0 +1,134 @@
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+class RedisCache(BaseCache):
+    """Кеш в Redis, общий для всех процессов и контейнеров.
+    LOCATION задаётся адресом вида `redis://host:6379/0`.
+    Целые числа хранятся как есть, чтобы incr() выполнялся атомарно
+    на стороне Redis, остальные значения сериализуются pickle.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        if redis is None:
+            raise ImproperlyConfigured(
+                'Для RedisCache нужен пакет redis: pip install redis'
+            )
+        self._server = server
+        self._options = params.get('OPTIONS', {})
+
+    @cached_property
+    def _client(self):
+        return redis.Redis.from_url(self._server, **self._options)
+
+    def _timeout(self, timeout):
+        """Возвращает время жизни записи в секундах; None — без срока."""
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return None
+        return max(int(timeout), 0)
+
+    @staticmethod
+    def _dumps(value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(value):
+        try:
+            return int(value)
+        except ValueError:
+            return pickle.loads(value)
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        if timeout == 0:
+            return False
+        return bool(self._client.set(
+            self._key(key, version), self._dumps(value), ex=timeout, nx=True
+        ))
+
+    def get(self, key, default=None, version=None):
+        value = self._client.get(self._key(key, version))
+        return default if value is None else self._loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        timeout = self._timeout(timeout)
+        if timeout == 0:
+            self._client.delete(key)
+            return
+        self._client.set(key, self._dumps(value), ex=timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        timeout = self._timeout(timeout)
+        if timeout is None:
+            return bool(self._client.persist(key))
+        return bool(self._client.expire(key, timeout))
+
+    def delete(self, key, version=None):
+        self._client.delete(self._key(key, version))
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._client.mget(
+            [self._key(key, version) for key in keys]
+        )
+        return {
+            key: self._loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        pipeline = self._client.pipeline()
+        for key, value in data.items():
+            key = self._key(key, version)
+            if timeout == 0:
+                pipeline.delete(key)
+            else:
+                pipeline.set(key, self._dumps(value), ex=timeout)
+        pipeline.execute()
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        if keys:
+            self._client.delete(*keys)
+
+    def has_key(self, key, version=None):
+        return bool(self._client.exists(self._key(key, version)))
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        if not self._client.exists(key):
+            raise ValueError(f"Key '{key}' not found")
+        return self._client.incr(key, delta)
+
+    def clear(self):
+        self._client.flushdb()
+
+    def close(self, **kwargs):
+        # Соединения держит пул клиента redis, закрывать их после
+        # каждого запроса не нужно.
+        pass
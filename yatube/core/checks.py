@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .db.pool import DEFAULT_MAX_SIZE
+
+
+@register()
+def check_database_pool_size(app_configs, **kwargs):
+    """Предупреждает, если пул соединений базы меньше числа потоков
+    процесса settings.DATABASE_THREADS: лишние потоки ждут соединение
+    POOL['TIMEOUT'] секунд и получают OperationalError.
+    """
+    warnings = []
+    for alias, database in settings.DATABASES.items():
+        if not database['ENGINE'].startswith('core.db.backends.'):
+            continue
+        size = (database.get('POOL') or {}).get('MAX_SIZE', DEFAULT_MAX_SIZE)
+        if size < settings.DATABASE_THREADS:
+            warnings.append(Warning(
+                f'Пул соединений базы {alias} ({size}) меньше числа '
+                f'потоков процесса ({settings.DATABASE_THREADS}).',
+                hint='Увеличьте DJANGO_DATABASE_POOL_SIZE или уменьшите '
+                     'GUNICORN_THREADS, DJANGO_ASGI_THREADS и '
+                     'DJANGO_BACKGROUND_WORKERS.',
+                id='core.W001',
+            ))
+    return warnings
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Предупреждает, если без DEBUG страницы кешируются в locmem:
+    у каждого процесса свой кеш, и записи в одном процессе не
+    сбрасывают страницы остальных до истечения CACHE_TIMEOUT.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or not backend.endswith('.LocMemCache'):
+        return []
+    return [Warning(
+        'Кеш страниц locmem не общий для процессов сервера.',
+        hint='Задайте DJANGO_CACHE_BACKEND=redis или file.',
+        id='core.W002',
+    )]
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def fragment_cache(request):
+    """Добавляет время жизни кешируемых фрагментов шаблонов."""
+    return {'fragment_cache_timeout': settings.CACHE_TIMEOUT}
@@ -0,0 +1,91 @@
+import logging
+
+from ..pool import ConnectionPool, PoolTimeout, close_pool, get_pool
+
+logger = logging.getLogger(__name__)
+
+# Ключи словаря POOL в settings.DATABASES и параметры ConnectionPool.
+POOL_OPTIONS = {
+    'MAX_SIZE': 'max_size',
+    'TIMEOUT': 'timeout',
+    'MAX_LIFETIME': 'max_lifetime',
+    'CHECK_AFTER': 'check_after',
+}
+
+
+class PooledDatabaseWrapperMixin:
+    """Берёт соединения DatabaseWrapper из пула процесса, а close()
+    возвращает соединение в пул вместо закрытия.
+    Пул общий для потоков и задаётся словарём POOL в настройках базы.
+    В конце каждого запроса соединение возвращается в пул, поэтому
+    CONN_MAX_AGE не действует: время жизни соединения ограничивает
+    POOL['MAX_LIFETIME'].
+    """
+
+    @property
+    def pool_key(self):
+        return (self.alias, self.settings_dict['NAME'])
+
+    def get_pool(self):
+        options = self.settings_dict.get('POOL') or {}
+        return get_pool(self.pool_key, lambda: ConnectionPool(**{
+            name: options[key]
+            for key, name in POOL_OPTIONS.items() if key in options
+        }))
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool()
+        try:
+            connection = pool.acquire(
+                lambda: super(
+                    PooledDatabaseWrapperMixin, self
+                ).get_new_connection(conn_params),
+                check=self.check_pooled_connection,
+            )
+        except PoolTimeout as error:
+            logger.warning('%s: %s', self.alias, error)
+            raise self.Database.OperationalError(str(error)) from error
+        self.init_pooled_connection(connection)
+        return connection
+
+    def init_pooled_connection(self, connection):
+        """Готовит соединение из пула для этого DatabaseWrapper."""
+
+    def check_pooled_connection(self, connection):
+        """Возвращает True, если соединение отвечает на запрос."""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except self.Database.Error:
+            return False
+        return True
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Соединение закрывается, если Django оставляет его у себя
+        # (close() внутри atomic) или после ошибок оно не отвечает.
+        reusable = not self.in_atomic_block
+        if reusable:
+            try:
+                self.connection.rollback()
+            except self.Database.Error:
+                reusable = False
+        if reusable and self.errors_occurred:
+            reusable = self.check_pooled_connection(self.connection)
+        self.get_pool().release(self.connection, reusable=reusable)
+
+    def close_if_unusable_or_obsolete(self):
+        if self.connection is not None and not self.in_atomic_block:
+            self.close()
+
+
+class PooledDatabaseCreationMixin:
+    """Закрывает соединения пула с тестовой базой перед её удалением."""
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pool((self.connection.alias, test_database_name))
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,19 @@
+from django.db.backends.postgresql import base, creation
+
+from ..mixins import PooledDatabaseCreationMixin, PooledDatabaseWrapperMixin
+
+
+class DatabaseCreation(PooledDatabaseCreationMixin, creation.DatabaseCreation):
+    pass
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """PostgreSQL с пулом соединений: ENGINE core.db.backends.postgresql."""
+
+    creation_class = DatabaseCreation
+
+    def init_pooled_connection(self, connection):
+        # Для новых соединений это делает get_new_connection() Django.
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level
+        )
@@ -0,0 +1,16 @@
+from django.db.backends.sqlite3 import base, creation
+
+from ..mixins import PooledDatabaseCreationMixin, PooledDatabaseWrapperMixin
+
+
+class DatabaseCreation(PooledDatabaseCreationMixin, creation.DatabaseCreation):
+    pass
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """SQLite с пулом соединений: ENGINE core.db.backends.sqlite3.
+    Нужен для разработки и тестов пула без PostgreSQL. Базы в памяти
+    Django не закрывает, поэтому их соединения в пул не возвращаются.
+    """
+
+    creation_class = DatabaseCreation
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Размер пула, если в POOL настроек базы нет MAX_SIZE.
+DEFAULT_MAX_SIZE = 10
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """Свободное соединение не появилось за время ожидания."""
+
+
+class ConnectionPool:
+    """Ограниченный пул соединений с базой, общий для потоков процесса.
+    Принимает необязательные max_size: int наибольшее число открытых
+    соединений, timeout: float сколько секунд ждать свободное
+    соединение, max_lifetime: float через сколько секунд после
+    открытия соединение закрывается вместо возврата в пул и
+    check_after: float после скольких секунд простоя соединение
+    проверяется перед выдачей.
+    Счётчики ожиданий и заполненности возвращает stats().
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, timeout=5.0,
+                 max_lifetime=1800.0, check_after=30.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        # Свободные соединения: (соединение, открыто, возвращено).
+        self._idle = deque()
+        # Выданные соединения: id(соединения) -> время открытия.
+        self._in_use = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self._counters = dict.fromkeys((
+            'acquired', 'created', 'discarded', 'waits', 'timeouts',
+            'peak_in_use',
+        ), 0)
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self, connect, check=None):
+        """Возвращает свободное соединение из пула или новое, открытое
+        вызовом connect(). Если открыто max_size соединений, ждёт
+        возврата одного из них не дольше timeout и бросает PoolTimeout.
+        Соединение, простоявшее дольше check_after, перед выдачей
+        проверяется вызовом check(соединение) и при False заменяется.
+        """
+        entry = self._reserve()
+        if entry is not None:
+            connection, created, released = entry
+            if (
+                check is not None
+                and time.monotonic() - released >= self.check_after
+                and not check(connection)
+            ):
+                self._close(connection)
+                entry = None
+        if entry is None:
+            try:
+                connection = connect()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            created = time.monotonic()
+        with self._condition:
+            if entry is None:
+                self._counters['created'] += 1
+            self._in_use[id(connection)] = created
+            self._counters['peak_in_use'] = max(
+                self._counters['peak_in_use'], len(self._in_use)
+            )
+        return connection
+
+    def _reserve(self):
+        """Возвращает свободное соединение или None, если занято место
+        под новое, и учитывает время ожидания.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Нет свободного соединения за {self.timeout} с, '
+                        f'открыто {self._size} из {self.max_size}'
+                    )
+                waited = True
+                self._condition.wait(remaining)
+            self._counters['acquired'] += 1
+            if waited:
+                wait = time.monotonic() - started
+                self._counters['waits'] += 1
+                self._wait_time += wait
+                self._max_wait = max(self._max_wait, wait)
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+            return None
+
+    def release(self, connection, reusable=True):
+        """Возвращает соединение в пул. Соединение закрывается, если
+        reusable ложно или истёк max_lifetime. Чужие соединения, например
+        унаследованные после fork(), просто закрываются.
+        """
+        now = time.monotonic()
+        with self._condition:
+            created = self._in_use.pop(id(connection), None)
+            if created is None:
+                keep = owned = False
+            else:
+                owned = True
+                keep = reusable and now - created < self.max_lifetime
+                if keep:
+                    self._idle.append((connection, created, now))
+                else:
+                    self._size -= 1
+                self._condition.notify()
+        if not keep:
+            self._close(connection, counted=owned)
+
+    def close(self):
+        """Закрывает свободные соединения пула."""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection, _, _ in idle:
+            self._close(connection, counted=False)
+
+    def _close(self, connection, counted=True):
+        if counted:
+            with self._condition:
+                self._counters['discarded'] += 1
+        try:
+            connection.close()
+        except Exception:
+            logger.debug('Ошибка при закрытии соединения', exc_info=True)
+
+    def stats(self):
+        """Возвращает словарь с размером пула и счётчиками ожиданий:
+        wait_time и max_wait — суммарное и наибольшее ожидание
+        в секундах, saturation — доля занятых соединений от max_size.
+        """
+        with self._condition:
+            in_use = len(self._in_use)
+            return {
+                **self._counters,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': in_use,
+                'idle': len(self._idle),
+                'wait_time': self._wait_time,
+                'max_wait': self._max_wait,
+                'saturation': in_use / self.max_size,
+            }
+
+
+def get_pool(key, factory):
+    """Возвращает пул текущего процесса по ключу key, при первом
+    обращении создавая его вызовом factory(). После fork() пулы
+    создаются заново: сокеты мастер-процесса не должны использоваться
+    воркерами.
+    """
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
+
+
+def close_pool(key):
+    """Закрывает свободные соединения пула key, если он создан."""
+    with _pools_lock:
+        pool = _pools.get(key) if _pools_pid == os.getpid() else None
+    if pool is not None:
+        pool.close()
+
+
+def pool_stats():
+    """Возвращает {ключ пула: stats()} для пулов текущего процесса."""
+    with _pools_lock:
+        pools = dict(_pools) if _pools_pid == os.getpid() else {}
+    return {key: pool.stats() for key, pool in pools.items()}
@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Кука, которая после записи направляет чтения пользователя в основную
+# базу, пока реплики догоняют её.
+PIN_COOKIE = 'read_primary'
+# Ключ кеша с той же отметкой для вошедшего пользователя: клиенты API
+# с JWT обычно не хранят куки.
+PIN_KEY = 'read_primary:{}'
+
+_state = threading.local()
+
+
+@contextmanager
+def read_from_replicas(enabled=True):
+    """Направляет чтения текущего потока в реплики из
+    settings.DATABASE_REPLICAS, а при enabled=False — в основную базу.
+    Вне блока, в том числе в фоновых задачах и командах, чтения идут
+    в основную базу.
+    """
+    previous = getattr(_state, 'replicas', False)
+    _state.replicas = enabled
+    try:
+        yield
+    finally:
+        _state.replicas = previous
+
+
+def read_fresh(versions):
+    """Возвращает контекст, направляющий чтения в основную базу, если
+    версия одной из областей (время изменения в микросекундах, см.
+    core.cache) моложе settings.REPLICA_PIN_SECONDS. Реплики могли ещё
+    не получить изменение, а построенная по ним страница попала бы
+    в кеш под новой версией.
+    """
+    changed = max(versions.values(), default=0) / 1_000_000
+    if time.time() - changed < settings.REPLICA_PIN_SECONDS:
+        return read_from_replicas(False)
+    return nullcontext()
+
+
+def pin_client(request, response):
+    """Направляет чтения клиента в основную базу на
+    settings.REPLICA_PIN_SECONDS после записи: куку PIN_COOKIE получает
+    ответ, а вошедший пользователь — отметку в кеше, которую проверяет
+    read_primary_if_pinned().
+    """
+    if not settings.DATABASE_REPLICAS:
+        return
+    response.set_cookie(
+        PIN_COOKIE, '1',
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite='Lax',
+    )
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(
+            PIN_KEY.format(user.pk), 1, settings.REPLICA_PIN_SECONDS
+        )
+
+
+def read_primary_if_pinned(user):
+    """Направляет остальные чтения запроса в основную базу, если
+    пользователь user недавно писал в неё. Вызывается, как только
+    пользователь запроса известен: для сессий — в
+    ReplicaRoutingMiddleware, для JWT — при аутентификации в API.
+    """
+    if (
+        getattr(_state, 'replicas', False)
+        and user is not None
+        and user.is_authenticated
+        and cache.get(PIN_KEY.format(user.pk))
+    ):
+        _state.replicas = False
+
+
+def pin_primary(view):
+    """Декоратор представлений, которые пишут в базу на GET-запрос
+    (подписка по ссылке): представление читает из основной базы,
+    а клиент после него — тоже, как после POST.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with read_from_replicas(False):
+            response = view(request, *args, **kwargs)
+        pin_client(request, response)
+        return response
+    return wrapper
+
+
+class ReplicaRouter:
+    """Отправляет чтения внутри read_from_replicas() в случайную реплику,
+    а запись и остальные чтения — в основную базу default.
+    Реплики — копии default, поэтому миграции к ним не применяются.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        if getattr(_state, 'replicas', False):
+            return random.choice(replicas)
+        # Без явного ответа Django читает связанные объекты из базы,
+        # откуда загружен исходный: пользователь запроса, прочитанный
+        # из реплики до read_primary_if_pinned(), увёл бы туда и их.
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Читает из реплик при GET, HEAD и OPTIONS. Запросы с записью
+    и следующие за ними в течение settings.REPLICA_PIN_SECONDS запросы
+    того же клиента (кука PIN_COOKIE) или пользователя (отметка
+    в кеше) читают из основной базы, чтобы пользователь сразу видел
+    свой пост, комментарий или подписку.
+    Представления, которые пишут на GET, помечаются pin_primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        with read_from_replicas(safe and PIN_COOKIE not in request.COOKIES):
+            response = self.get_response(request)
+        if not safe:
+            pin_client(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        read_primary_if_pinned(getattr(request, 'user', None))
@@ -0,0 +1,90 @@
+import math
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _percentile(values, percent):
+    index = max(math.ceil(len(values) * percent / 100) - 1, 0)
+    return values[index]
+
+
+class Command(BaseCommand):
+    """Нагрузочный тест запущенного сервера."""
+
+    help = (
+        'Отправляет запросы на URL с заданным числом одновременных '
+        'клиентов и выводит пропускную способность и задержки. '
+        'Сравните WSGI и ASGI, запустив сервер с одним и тем же числом '
+        'процессов в обоих режимах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='+', help='URL, которые запрашиваются по кругу.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            '-c',
+            type=int,
+            default=32,
+            help='Число одновременных клиентов.'
+        )
+        parser.add_argument(
+            '--requests',
+            '-n',
+            type=int,
+            default=1000,
+            help='Общее число запросов.'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=30,
+            help='Таймаут одного запроса в секундах.'
+        )
+
+    def fetch(self, url, timeout):
+        """Возвращает (время ответа, ошибка или None)."""
+        started = time.perf_counter()
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+        except HTTPError as error:
+            return time.perf_counter() - started, f'HTTP {error.code}'
+        except (URLError, OSError) as error:
+            return time.perf_counter() - started, str(error)
+        return time.perf_counter() - started, None
+
+    def handle(self, *args, **options):
+        urls = options['urls']
+        total = options['requests']
+        if total < 1 or options['concurrency'] < 1:
+            raise CommandError('Число запросов и клиентов должно быть > 0')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(executor.map(
+                lambda number: self.fetch(
+                    urls[number % len(urls)], options['timeout']
+                ),
+                range(total)
+            ))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _ in results)
+        errors = [error for _, error in results if error is not None]
+        self.stdout.write(
+            f'Запросов: {total}, клиентов: {options["concurrency"]}, '
+            f'ошибок: {len(errors)}\n'
+            f'Пропускная способность: {total / elapsed:.1f} запросов/с\n'
+            'Задержка, мс: '
+            f'p50 {_percentile(latencies, 50) * 1000:.0f}, '
+            f'p95 {_percentile(latencies, 95) * 1000:.0f}, '
+            f'p99 {_percentile(latencies, 99) * 1000:.0f}, '
+            f'max {latencies[-1] * 1000:.0f}'
+        )
+        for error in sorted(set(errors))[:5]:
+            self.stderr.write(f'Ошибка: {error}')
@@ -0,0 +1,51 @@
+import logging
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+
+
+def _get_executor():
+    """Возвращает пул фоновых потоков текущего процесса.
+    Пул создаётся заново после fork(), иначе воркеры gunicorn
+    унаследовали бы неработающие потоки мастер-процесса.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix='background'
+        )
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась с ошибкой',
+                         func.__name__)
+    finally:
+        close_old_connections()
+
+
+def enqueue(func, *args, **kwargs):
+    """Ставит вызов func(*args, **kwargs) в очередь фоновых задач.
+    Задача запускается после фиксации текущей транзакции, чтобы
+    воркер видел сохранённые данные. При settings.BACKGROUND_TASKS_SYNC
+    задача выполняется сразу в текущем потоке.
+    """
+    def submit():
+        if settings.BACKGROUND_TASKS_SYNC:
+            _run(func, args, kwargs)
+        else:
+            _get_executor().submit(_run, func, args, kwargs)
+    transaction.on_commit(submit)
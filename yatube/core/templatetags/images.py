@@ -0,0 +1,57 @@
+import logging
+
+from django import template
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from core.thumbnails import (
+    RENDITION_FORMATS, RENDITION_SIZES, get_cached_renditions,
+)
+
+register = template.Library()
+logger = logging.getLogger(__name__)
+
+
+def _srcset(thumbnails):
+    return ', '.join(
+        f'{thumbnail.url} {thumbnail.width}w' for thumbnail in thumbnails
+    )
+
+
+@register.inclusion_tag('includes/picture.html')
+def picture(image, css_class=''):
+    """Выводит картинку тегом <picture> с рендишенами в AVIF/WebP
+    и нескольких ширинах, браузер сам выбирает подходящую.
+    Принимает обязательный image: ImageFieldFile и необязательный
+    css_class: str для тега <img>.
+    Рендишены создаёт фоновая задача; пока их нет, выводится исходная
+    картинка. Тег не должен попадать в {% cache %}: иначе исходная
+    картинка закешировалась бы вместе с фрагментом.
+    """
+    if not image:
+        return {}
+    try:
+        renditions = get_cached_renditions(image)
+    except Exception:
+        # Как и тег {% thumbnail %}, ошибка хранилища миниатюр
+        # не должна ронять всю страницу.
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise
+        logger.exception('Не удалось найти рендишены %s', image.name)
+        renditions = None
+    if renditions is None:
+        return {'original': image, 'css_class': css_class}
+    *modern, fallback = renditions
+    fallback = renditions[fallback]
+    return {
+        'sources': [
+            {
+                'type': RENDITION_FORMATS[name]['mime_type'],
+                'srcset': _srcset(renditions[name]),
+            }
+            for name in modern
+        ],
+        'img': fallback[-1],
+        'srcset': _srcset(fallback),
+        'sizes': RENDITION_SIZES,
+        'css_class': css_class,
+    }
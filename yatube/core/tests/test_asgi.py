@@ -0,0 +1,177 @@
+import asyncio
+import threading
+
+from unittest import mock
+
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+
+from ..asgi import ClientDisconnected, WSGIThreadPoolApplication
+
+
+def http_scope(path, method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver'), *headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+
+def call(application, scope, body=b'', messages=None):
+    """Выполняет ASGI-запрос и возвращает (статус, заголовки, тело).
+    Необязательный messages: list заменяет сообщение с телом body.
+    """
+    if messages is None:
+        messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    if not sent:
+        return None
+    start = sent[0]
+    return (
+        start['status'],
+        dict(start['headers']),
+        b''.join(message.get('body', b'') for message in sent[1:]),
+    )
+
+
+class WSGIThreadPoolApplicationTest(SimpleTestCase):
+    """Тесты ASGI-приложения поверх WSGI-приложения Django."""
+
+    def test_django_page(self):
+        """Страница отдаётся так же, как через WSGI."""
+        application = WSGIThreadPoolApplication(
+            get_wsgi_application(), max_workers=2
+        )
+        status, headers, body = call(application, http_scope('/about/tech/'))
+        self.assertEqual(status, 200)
+        self.assertIn(b'text/html', headers[b'content-type'])
+        self.assertEqual(body, self.client.get('/about/tech/').content)
+
+    def test_environ_and_body(self):
+        """Заголовки, строка запроса и тело попадают в environ."""
+        seen = {}
+
+        def wsgi(environ, start_response):
+            seen.update(environ)
+            seen['body'] = environ['wsgi.input'].read()
+            start_response('201 Created', [('X-Test', '1')])
+            return [b'part1', b'', b'part2']
+
+        status, headers, body = call(
+            WSGIThreadPoolApplication(wsgi, max_workers=1),
+            http_scope(
+                '/api/v1/posts/', method='POST', query_string=b'a=1',
+                headers=[
+                    (b'content-type', b'application/json'),
+                    (b'accept', b'text/html'),
+                    (b'accept', b'application/json'),
+                ]
+            ),
+            body=b'{"text": "1"}'
+        )
+        self.assertEqual((status, headers[b'x-test'], body),
+                         (201, b'1', b'part1part2'))
+        self.assertEqual(seen['REQUEST_METHOD'], 'POST')
+        self.assertEqual(seen['PATH_INFO'], '/api/v1/posts/')
+        self.assertEqual(seen['QUERY_STRING'], 'a=1')
+        self.assertEqual(seen['CONTENT_TYPE'], 'application/json')
+        self.assertEqual(seen['HTTP_ACCEPT'], 'text/html,application/json')
+        self.assertEqual(seen['body'], b'{"text": "1"}')
+
+    @mock.patch('core.asgi.MAX_MEMORY_BODY_SIZE', 4)
+    def test_large_body_streamed(self):
+        """Начало тела читается до запуска приложения, а остаток
+        приложение получает по мере чтения и может не дочитывать.
+        """
+        messages = [
+            {'type': 'http.request', 'body': b'ab', 'more_body': True},
+            {'type': 'http.request', 'body': b'cd', 'more_body': True},
+            {'type': 'http.request', 'body': b'ef', 'more_body': True},
+            {'type': 'http.request', 'body': b'gh'},
+        ]
+
+        def wsgi(environ, start_response):
+            self.assertEqual(len(messages), 2)
+            body = environ['wsgi.input'].read(6)
+            start_response('200 OK', [])
+            return [body]
+
+        status, _, body = call(
+            WSGIThreadPoolApplication(wsgi, max_workers=1),
+            http_scope('/', method='POST'), messages=messages
+        )
+        self.assertEqual((status, body), (200, b'abcdef'))
+        self.assertEqual(len(messages), 1)
+
+    @mock.patch('core.asgi.MAX_MEMORY_BODY_SIZE', 4)
+    def test_client_disconnect(self):
+        """Приложение не запускается с обрезанным телом, а отключение
+        во время чтения приложением прерывает чтение.
+        """
+        wsgi = mock.Mock()
+        self.assertIsNone(call(
+            WSGIThreadPoolApplication(wsgi, max_workers=1),
+            http_scope('/', method='POST'), messages=[
+                {'type': 'http.request', 'body': b'ab', 'more_body': True},
+                {'type': 'http.disconnect'},
+            ]
+        ))
+        wsgi.assert_not_called()
+
+        def reading_wsgi(environ, start_response):
+            with self.assertRaises(ClientDisconnected):
+                environ['wsgi.input'].read()
+            start_response('400 Bad Request', [])
+            return []
+
+        status, _, _ = call(
+            WSGIThreadPoolApplication(reading_wsgi, max_workers=1),
+            http_scope('/', method='POST'), messages=[
+                {'type': 'http.request', 'body': b'abcd', 'more_body': True},
+                {'type': 'http.disconnect'},
+            ]
+        )
+        self.assertEqual(status, 400)
+
+    def test_concurrent_requests(self):
+        """Запросы одного процесса выполняются в потоках параллельно."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wsgi(environ, start_response):
+            barrier.wait()
+            start_response('200 OK', [])
+            return [b'ok']
+
+        application = WSGIThreadPoolApplication(wsgi, max_workers=3)
+
+        async def run_all():
+            async def one():
+                sent = []
+
+                async def receive():
+                    return {'type': 'http.request', 'body': b''}
+
+                async def send(message):
+                    sent.append(message)
+
+                await application(http_scope('/'), receive, send)
+                return sent[0]['status']
+
+            return await asyncio.gather(one(), one(), one())
+
+        self.assertEqual(asyncio.run(run_all()), [200, 200, 200])
@@ -0,0 +1,121 @@
+import shutil
+import tempfile
+
+from decouple import config
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from ..cache_backends import redis
+from ..checks import check_shared_cache
+
+TEMP_CACHE_ROOT = tempfile.mkdtemp()
+REDIS_URL = config('TEST_REDIS_URL', default='redis://localhost:6379/15')
+
+
+def shared_caches(backend, location):
+    """Настройки двух алиасов кеша, эмулирующих два воркера gunicorn
+    с общим хранилищем.
+    """
+    return {
+        alias: {'BACKEND': backend, 'LOCATION': location}
+        for alias in ('default', 'worker_1', 'worker_2')
+    }
+
+
+@override_settings(CACHES=shared_caches(
+    'django.core.cache.backends.filebased.FileBasedCache', TEMP_CACHE_ROOT
+))
+class FileCacheTest(SimpleTestCase):
+    """Проверяет общий файловый кеш."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_CACHE_ROOT, ignore_errors=True)
+
+    def test_workers_share_cache(self):
+        """Запись одного воркера видна другому."""
+        caches['worker_1'].set('page', 'html')
+        self.assertEqual(caches['worker_2'].get('page'), 'html')
+
+
+@override_settings(CACHES=shared_caches(
+    'core.cache_backends.RedisCache', REDIS_URL
+))
+class RedisCacheTest(SimpleTestCase):
+    """Проверяет RedisCache на сервере TEST_REDIS_URL.
+    Тесты пропускаются, если пакет redis не установлен или
+    сервер недоступен.
+    """
+
+    def setUp(self):
+        if redis is None:
+            self.skipTest('Пакет redis не установлен.')
+        self.cache = caches['worker_1']
+        try:
+            self.cache.clear()
+        except redis.ConnectionError:
+            self.skipTest(f'Redis недоступен по адресу {REDIS_URL}.')
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_workers_share_cache(self):
+        """Запись одного воркера видна другому."""
+        self.cache.set('page', {'html': '<p>'})
+        self.assertEqual(caches['worker_2'].get('page'), {'html': '<p>'})
+
+    def test_add_and_delete(self):
+        """add() не перезаписывает ключ, delete() удаляет его."""
+        self.assertTrue(self.cache.add('key', 1))
+        self.assertFalse(self.cache.add('key', 2))
+        self.assertEqual(self.cache.get('key'), 1)
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_incr_is_atomic_counter(self):
+        """incr() работает с числами, сохранёнными через set()."""
+        self.cache.set('version', 1)
+        self.assertEqual(self.cache.incr('version'), 2)
+        self.assertEqual(self.cache.get('version'), 2)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_many(self):
+        """set_many(), get_many() и delete_many() работают пакетно."""
+        self.cache.set_many({'a': 1, 'b': 'два'})
+        self.assertEqual(
+            self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 'два'}
+        )
+        self.cache.delete_many(['a', 'b'])
+        self.assertEqual(self.cache.get_many(['a', 'b']), {})
+
+    def test_zero_timeout_does_not_store(self):
+        """Значение с timeout=0 не сохраняется."""
+        self.cache.set('key', 'value', timeout=0)
+        self.assertFalse(self.cache.has_key('key'))
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """Проверяет предупреждение о кеше locmem без DEBUG."""
+
+    def test_locmem_without_debug(self):
+        """locmem допустим только в разработке."""
+        locmem = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        shared = shared_caches(
+            'django.core.cache.backends.filebased.FileBasedCache',
+            TEMP_CACHE_ROOT
+        )
+        for debug, caches_setting, expected in (
+            (False, locmem, ['core.W002']),
+            (True, locmem, []),
+            (False, shared, []),
+        ):
+            with self.subTest(debug=debug, caches=caches_setting):
+                with override_settings(DEBUG=debug, CACHES=caches_setting):
+                    self.assertEqual(
+                        [warning.id for warning in check_shared_cache(None)],
+                        expected
+                    )
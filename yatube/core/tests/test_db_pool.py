@@ -0,0 +1,193 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from unittest import mock
+
+from django.conf import settings
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+
+from ..checks import check_database_pool_size
+from ..db import pool as pool_module
+from ..db.backends.sqlite3.base import DatabaseWrapper
+from ..db.pool import ConnectionPool, PoolTimeout, get_pool, pool_stats
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """Тесты ограниченного пула соединений."""
+
+    def test_reuses_released_connection(self):
+        """Возвращённое соединение выдаётся снова без открытия нового."""
+        pool = ConnectionPool(max_size=2)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        self.assertIs(pool.acquire(FakeConnection), connection)
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['acquired'], 2)
+        self.assertEqual(stats['saturation'], 0.5)
+
+    def test_timeout_when_exhausted(self):
+        """Занятый пул не открывает лишних соединений."""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        stats = pool.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['saturation'], 1)
+
+    def test_waits_for_release(self):
+        """Ожидание свободного соединения учитывается в счётчиках."""
+        pool = ConnectionPool(max_size=1, timeout=5)
+        connection = pool.acquire(FakeConnection)
+        timer = threading.Timer(0.05, pool.release, (connection,))
+        timer.start()
+        self.assertIs(pool.acquire(FakeConnection), connection)
+        timer.join()
+        stats = pool.stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['max_wait'], 0)
+
+    def test_health_check_replaces_broken_connection(self):
+        """Непрошедшее проверку соединение закрывается и заменяется."""
+        pool = ConnectionPool(check_after=0)
+        broken = pool.acquire(FakeConnection)
+        pool.release(broken)
+        connection = pool.acquire(FakeConnection, check=lambda conn: False)
+        self.assertIsNot(connection, broken)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.stats()['size'], 1)
+        self.assertEqual(pool.stats()['discarded'], 1)
+
+    def test_closes_unusable_and_old_connections(self):
+        """Соединения с ошибками и старше max_lifetime закрываются."""
+        for pool, reusable in (
+            (ConnectionPool(), False),
+            (ConnectionPool(max_lifetime=0), True),
+        ):
+            with self.subTest(max_lifetime=pool.max_lifetime):
+                connection = pool.acquire(FakeConnection)
+                pool.release(connection, reusable=reusable)
+                self.assertTrue(connection.closed)
+                self.assertEqual(pool.stats()['size'], 0)
+
+    def test_failed_connect_frees_slot(self):
+        """Ошибка открытия соединения не занимает место в пуле."""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        with self.assertRaises(ConnectionError):
+            pool.acquire(mock.Mock(side_effect=ConnectionError))
+        self.assertIsInstance(pool.acquire(FakeConnection), FakeConnection)
+
+    def test_pools_recreated_after_fork(self):
+        """После fork() процесс получает новые пулы."""
+        first = get_pool('fork-test', ConnectionPool)
+        self.assertIs(get_pool('fork-test', ConnectionPool), first)
+        with mock.patch.object(
+            pool_module.os, 'getpid', return_value=os.getpid() + 1
+        ):
+            self.assertIsNot(get_pool('fork-test', ConnectionPool), first)
+        get_pool('fork-test', ConnectionPool)
+
+
+class PooledBackendTest(SimpleTestCase):
+    """Тесты движка с пулом на SQLite в файле."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.settings_dict = {
+            'ENGINE': 'core.db.backends.sqlite3',
+            'NAME': os.path.join(directory, 'pooled.sqlite3'),
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': '',
+            'PORT': '',
+            'ATOMIC_REQUESTS': False,
+            'AUTOCOMMIT': True,
+            'CONN_MAX_AGE': 60,
+            'OPTIONS': {},
+            'TIME_ZONE': None,
+            'TEST': {},
+            'POOL': {'MAX_SIZE': 1, 'TIMEOUT': 0.01},
+        }
+
+    def wrapper(self):
+        wrapper = DatabaseWrapper(self.settings_dict, alias='pooled')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_connection_returned_to_pool(self):
+        """Закрытое соединение переходит к следующему потоку."""
+        first = self.wrapper()
+        with first.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id integer)')
+        raw = first.connection
+        first.close_if_unusable_or_obsolete()
+        self.assertIsNone(first.connection)
+        second = self.wrapper()
+        with second.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM item')
+            self.assertEqual(cursor.fetchone(), (0,))
+        self.assertIs(second.connection, raw)
+        stats = pool_stats()[('pooled', self.settings_dict['NAME'])]
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_exhausted_pool_raises_operational_error(self):
+        """Нехватка соединений — OperationalError Django."""
+        self.wrapper().ensure_connection()
+        with self.assertRaises(OperationalError):
+            self.wrapper().ensure_connection()
+
+    def test_uncommitted_transaction_rolled_back(self):
+        """Незавершённая транзакция откатывается при возврате в пул."""
+        first = self.wrapper()
+        with first.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id integer)')
+        first.set_autocommit(False)
+        with first.cursor() as cursor:
+            cursor.execute('INSERT INTO item VALUES (1)')
+        first.close()
+        with self.wrapper().cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM item')
+            self.assertEqual(cursor.fetchone(), (0,))
+
+
+@override_settings(DATABASE_THREADS=12)
+class PoolSizeCheckTest(SimpleTestCase):
+    """Тесты проверки размера пула по числу потоков процесса."""
+
+    def check(self, database):
+        with mock.patch.dict(settings.DATABASES, {'pooled': database}):
+            return [
+                warning.id for warning in check_database_pool_size(None)
+            ]
+
+    def test_small_pool(self):
+        """Пул меньше числа потоков вызывает предупреждение."""
+        for pool in ({'MAX_SIZE': 4}, {}):
+            with self.subTest(pool=pool):
+                self.assertEqual(self.check({
+                    'ENGINE': 'core.db.backends.postgresql', 'POOL': pool,
+                }), ['core.W001'])
+
+    def test_enough_connections(self):
+        """Достаточный пул и движки без пула не проверяются."""
+        for database in (
+            {'ENGINE': 'core.db.backends.sqlite3', 'POOL': {'MAX_SIZE': 12}},
+            {'ENGINE': 'django.db.backends.postgresql', 'POOL': {}},
+        ):
+            with self.subTest(engine=database['ENGINE']):
+                self.assertEqual(self.check(database), [])
@@ -0,0 +1,70 @@
+import os
+import runpy
+
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+CONFIG_PATH = os.path.join(settings.BASE_DIR, 'docker', 'gunicorn.conf.py')
+
+
+def load_config(**environ):
+    """Возвращает настройки gunicorn.conf.py при переменных environ."""
+    with mock.patch.dict(os.environ, environ):
+        return runpy.run_path(CONFIG_PATH)
+
+
+class GunicornConfigTest(SimpleTestCase):
+    """Тесты конфигурации gunicorn."""
+
+    def test_defaults(self):
+        """По умолчанию gthread с предзагрузкой и числом процессов
+        по числу доступных процессоров.
+        """
+        config = load_config(SERVER_INTERFACE='', GUNICORN_WORKERS='')
+        self.assertEqual(config['wsgi_app'], 'yatube.wsgi:application')
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertTrue(config['preload_app'])
+        self.assertEqual(config['workers'], config['cpus'] + 1)
+        self.assertEqual(
+            config['max_requests_jitter'], config['max_requests'] // 5
+        )
+
+    def test_environment_overrides(self):
+        """Настройки меняются переменными окружения."""
+        config = load_config(
+            SERVER_INTERFACE='asgi',
+            GUNICORN_WORKERS='3',
+            GUNICORN_PRELOAD='false',
+            GUNICORN_MAX_REQUESTS='100',
+        )
+        self.assertEqual(config['wsgi_app'], 'yatube.asgi:application')
+        self.assertEqual(
+            config['worker_class'], 'uvicorn.workers.UvicornWorker'
+        )
+        self.assertEqual(config['workers'], 3)
+        self.assertFalse(config['preload_app'])
+        self.assertEqual(config['max_requests_jitter'], 20)
+
+    def test_default_workers(self):
+        """Синхронным процессам нужно 2 * CPU + 1, остальным CPU + 1."""
+        default_workers = load_config()['default_workers']
+        self.assertEqual(default_workers('sync', 2), 5)
+        self.assertEqual(default_workers('gthread', 2), 3)
+
+    def test_available_cpus_respects_quota(self):
+        """Квота cgroup ограничивает число процессоров."""
+        available_cpus = load_config()['available_cpus']
+        affinity = len(os.sched_getaffinity(0))
+        with mock.patch.dict(
+            available_cpus.__globals__, _cgroup_cpu_limit=lambda: 1.5
+        ):
+            self.assertEqual(available_cpus(), min(2, affinity))
+
+    def test_memory_report(self):
+        """Отчёт о памяти содержит RSS текущего процесса."""
+        config = load_config()
+        usage = config['memory_usage']()
+        self.assertGreater(usage['rss'], 0)
+        self.assertIn('rss', config['format_memory'](usage))
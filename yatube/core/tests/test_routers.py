@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+
+from django.apps import apps
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from posts.models import Follow, Post
+from posts.tests.setup_data import create_post, create_user
+from ..db.routers import PIN_COOKIE, ReplicaRouter, read_from_replicas
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_PIN_SECONDS=0)
+class ReplicaRoutingTest(TestCase):
+    """Тесты чтения из реплики на второй базе SQLite.
+    В реплику копируются только пользователь и его сессия, поэтому
+    по ответу видно, из какой базы прочитаны посты.
+    """
+
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        connections.databases[REPLICA] = {
+            **connections.databases['default'],
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+            'TEST': {},
+        }
+        with connections[REPLICA].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        cls.post = create_post(author=cls.user)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.user.save(using=REPLICA)
+        Session.objects.get(
+            session_key=self.client.session.session_key
+        ).save(using=REPLICA)
+
+    def test_router(self):
+        """Реплика используется только для чтения внутри
+        read_from_replicas() и не получает миграций. Вне блока чтения
+        идут в основную базу, даже если объект прочитан из реплики.
+        """
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Post), 'default')
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Post), REPLICA)
+            self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA, 'posts'))
+        self.assertTrue(router.allow_migrate('default', 'posts'))
+
+    def test_safe_requests_read_from_replica(self):
+        """Списки сайта и API читаются из реплики."""
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('post-list'),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, self.post.text)
+
+    @override_settings(REPLICA_PIN_SECONDS=60)
+    def test_recent_changes_read_from_primary(self):
+        """Страница недавно изменённых данных строится по основной
+        базе, чтобы в кеш не попала отстающая копия.
+        """
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, self.post.text)
+
+    def test_writes_pin_to_primary(self):
+        """После записи клиент читает из основной базы."""
+        author = create_user(username='Followed')
+        writes = (
+            ('post', reverse('posts:post_create'), {'text': 'Новый пост'}),
+            ('post', reverse('posts:add_comment', args=(self.post.id,)),
+             {'text': 'Комментарий'}),
+            ('get', reverse('posts:profile_follow', args=(author.username,)),
+             {}),
+        )
+        for method, url, data in writes:
+            with self.subTest(url=url):
+                self.client.cookies.pop(PIN_COOKIE, None)
+                response = getattr(self.client, method)(url, data)
+                self.assertEqual(response.status_code, 302)
+                self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertTrue(
+            Follow.objects.filter(user=self.user, author=author).exists()
+        )
+        response = self.client.get(reverse('post-list'))
+        self.assertContains(response, 'Новый пост')
+
+    @override_settings(REPLICA_PIN_SECONDS=60)
+    def test_api_writes_pin_user(self):
+        """Клиент API без кук после записи тоже читает из основной
+        базы: отметка хранится в кеше по пользователю.
+        """
+        author = create_user(username='Followed')
+        self.client.logout()
+        token = {
+            'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        response = self.client.post(
+            reverse('follow-list'), {'following': author.username}, **token
+        )
+        self.assertEqual(response.status_code, 201)
+        self.client.cookies.clear()
+        response = self.client.get(reverse('follow-list'), **token)
+        self.assertContains(response, author.username)
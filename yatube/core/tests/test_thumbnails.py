@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..thumbnails import (
+    RENDITION_WIDTHS, RenditionBackend, get_renditions, rendition_options,
+)
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+class FakeThumbnail:
+    def __init__(self, name, width):
+        self.url = f'/media/{name}'
+        self.width = width
+        self.height = round(width * 338 / 960)
+
+
+def fake_get_thumbnail(image, geometry, **options):
+    width = int(geometry.split('x')[0])
+    return FakeThumbnail(f'{width}.{options["format"].lower()}', width)
+
+
+def render_picture(image):
+    return Template(
+        "{% load images %}{% picture image 'card-img' %}"
+    ).render(Context({'image': image}))
+
+
+class RenditionsTest(TestCase):
+    """Тесты рендишенов картинок."""
+
+    def test_rendition_options(self):
+        """Для каждого формата есть все ширины, а картинки
+        не увеличиваются.
+        """
+        formats = {options['format'] for _, options in rendition_options()}
+        self.assertTrue({'WEBP', 'JPEG'} <= formats)
+        self.assertEqual(
+            len(rendition_options()), len(formats) * len(RENDITION_WIDTHS)
+        )
+        for geometry, options in rendition_options():
+            with self.subTest(geometry=geometry, format=options['format']):
+                self.assertFalse(options['upscale'])
+
+    def test_avif_filename(self):
+        """Бэкенд даёт миниатюрам AVIF расширение .avif."""
+        source = mock.Mock(key='source-key')
+        name = RenditionBackend()._get_thumbnail_filename(
+            source, '320x113', {'format': 'AVIF'}
+        )
+        self.assertTrue(name.endswith('.avif'))
+
+    @mock.patch.object(
+        RenditionBackend, 'get_cached_thumbnail',
+        lambda self, image, geometry, **options: fake_get_thumbnail(
+            image, geometry, **options
+        )
+    )
+    def test_picture_tag(self):
+        """Тег picture выводит srcset для современных форматов
+        и запасной JPEG в <img>.
+        """
+        html = render_picture(mock.Mock(name='posts/a.jpg'))
+        self.assertIn(
+            'srcset="/media/320.webp 320w, /media/640.webp 640w, '
+            '/media/960.webp 960w"',
+            html
+        )
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('src="/media/960.jpeg"', html)
+        self.assertIn('srcset="/media/320.jpeg 320w', html)
+
+    @mock.patch('core.thumbnails.get_thumbnail')
+    def test_picture_tag_without_renditions(self, get_thumbnail):
+        """Пока рендишены не созданы, тег выводит исходную картинку
+        и не создаёт миниатюры во время запроса.
+        """
+        image = mock.Mock(url='/media/posts/a.jpg')
+        image.name = 'posts/a.jpg'
+        for cached in (None, mock.Mock(side_effect=OSError)):
+            with self.subTest(cached=cached), mock.patch.object(
+                RenditionBackend, 'get_cached_thumbnail',
+                cached or mock.Mock(return_value=None)
+            ):
+                html = render_picture(image)
+                self.assertIn('src="/media/posts/a.jpg"', html)
+                self.assertNotIn('<picture>', html)
+        get_thumbnail.assert_not_called()
+
+    def test_picture_tag_without_image(self):
+        """Без картинки тег ничего не выводит."""
+        html = Template('{% load images %}{% picture image %}').render(
+            Context({'image': None})
+        )
+        self.assertEqual(html.strip(), '')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@skipUnless(
+    hasattr(Image, 'ANTIALIAS'), 'sorl-thumbnail 12.7 требует Pillow < 10'
+)
+class RenditionFilesTest(TestCase):
+    """Создаёт настоящие рендишены картинки."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_small_image_is_not_upscaled(self):
+        """Маленькая картинка даёт по одному рендишену на формат."""
+        storage = FileSystemStorage(location=TEMP_MEDIA_ROOT)
+        image = Image.new('RGB', (200, 100))
+        content = ContentFile(b'')
+        image.save(content, 'PNG')
+        name = storage.save('small.png', content)
+        with storage.open(name) as file:
+            renditions = get_renditions(file)
+        for thumbnails in renditions.values():
+            self.assertEqual([t.width for t in thumbnails], [200])
@@ -0,0 +1,140 @@
+import io
+import shutil
+import tempfile
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from posts.tests.setup_data import create_user, image_path
+from ..uploads import ImageUploadHandler, RejectedUpload
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def png(width, height):
+    """Возвращает PNG заданного размера: однотонная картинка хорошо
+    сжимается, поэтому файл маленький при большом числе пикселей.
+    """
+    content = io.BytesIO()
+    Image.new('L', (width, height)).save(content, 'PNG')
+    return SimpleUploadedFile('big.png', content.getvalue(), 'image/png')
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    IMAGE_UPLOAD_MAX_SIZE=10 * 1024,
+    IMAGE_UPLOAD_MAX_PIXELS=100 * 100,
+)
+class ImageUploadTest(TestCase):
+    """Проверяет ограничения загружаемых картинок."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ImageUploadTest.user)
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(ImageUploadTest.user)
+
+    def test_handler_stops_reading_oversized_file(self):
+        """Обработчик перестаёт принимать данные сверх лимита."""
+        handler = ImageUploadHandler()
+        handler.new_file('image', 'big.gif', 'image/gif', None)
+        chunk = image_path('a.gif').read()
+        self.assertEqual(handler.receive_data_chunk(chunk, 0), chunk)
+        padding = b'\0' * settings.IMAGE_UPLOAD_MAX_SIZE
+        self.assertIsNone(handler.receive_data_chunk(padding, len(chunk)))
+        self.assertIsNone(handler.receive_data_chunk(b'\0', 0))
+        rejected = handler.file_complete(0)
+        self.assertIsInstance(rejected, RejectedUpload)
+        self.assertEqual(rejected.read(), b'')
+
+    def test_rejected_uploads(self):
+        """Слишком большие файлы, картинки и не картинки отклоняются
+        и формой, и API.
+        """
+        uploads = (
+            (lambda: SimpleUploadedFile(
+                'big.gif', b'GIF89a' + b'\0' * 20 * 1024, 'image/gif'
+            ), 'Размер файла'),
+            (lambda: png(200, 200), 'пикселей'),
+            (lambda: SimpleUploadedFile(
+                'text.gif', b'text' * 100, 'image/gif'
+            ), 'правильное изображение'),
+        )
+        for upload, message in uploads:
+            with self.subTest(message=message):
+                response = self.client.post(
+                    reverse('posts:post_create'),
+                    data={'text': 'Пост', 'image': upload()}
+                )
+                self.assertIn(
+                    message, response.context['form'].errors['image'][0]
+                )
+                response = self.api_client.post(
+                    reverse('post-list'),
+                    data={'text': 'Пост', 'image': upload()}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.json()['image'][0])
+        self.assertFalse(Post.objects.exists())
+
+    def test_handler_only_for_post_forms(self):
+        """Обработчик ставится в формах и API постов до проверки
+        CSRF-токена, а не для всех загрузок.
+        """
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(ImageUploadTest.user)
+        response = client.post(
+            reverse('posts:post_create'), data={'text': 'Пост'}
+        )
+        self.assertTemplateUsed(response, 'core/403csrf.html')
+        self.assertFalse(Post.objects.exists())
+        client.get(reverse('posts:post_create'))
+        with mock.patch.object(
+            ImageUploadHandler, 'file_complete', autospec=True,
+            side_effect=ImageUploadHandler.file_complete,
+        ) as file_complete:
+            response = client.post(reverse('posts:post_create'), data={
+                'text': 'Пост',
+                'image': png(50, 50),
+                'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+            })
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(file_complete.call_count, 1)
+            self.api_client.post(
+                reverse('post-list'),
+                data={'text': 'Пост', 'image': png(50, 50)}
+            )
+            self.assertEqual(file_complete.call_count, 2)
+            self.client.post(reverse('posts:add_comment', args=(
+                Post.objects.first().id,
+            )), data={'text': 'Комментарий', 'file': png(50, 50)})
+            self.assertEqual(file_complete.call_count, 2)
+
+    def test_valid_upload(self):
+        """Картинка в пределах ограничений сохраняется."""
+        self.client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост', 'image': png(100, 100)}
+        )
+        self.api_client.post(
+            reverse('post-list'),
+            data={'text': 'Пост', 'image': png(50, 50)}
+        )
+        self.assertEqual(Post.objects.exclude(image='').count(), 2)
@@ -0,0 +1,124 @@
+from PIL import Image
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import (
+    defaults as default_settings, settings as thumbnail_settings,
+)
+from sorl.thumbnail.images import ImageFile
+
+try:
+    import pillow_avif  # noqa: F401
+except ImportError:  # pragma: no cover
+    pillow_avif = None
+
+# Пропорции миниатюры картинки поста: 960x338.
+RENDITION_RATIO = 338 / 960
+RENDITION_WIDTHS = (320, 640, 960)
+# Форматы в порядке предпочтения; последний — запасной для <img>.
+RENDITION_FORMATS = {
+    'AVIF': {'mime_type': 'image/avif', 'quality': 60},
+    'WEBP': {'mime_type': 'image/webp', 'quality': 80},
+    'JPEG': {'mime_type': 'image/jpeg', 'quality': 85},
+}
+RENDITION_SIZES = '(max-width: 960px) 100vw, 960px'
+
+
+class RenditionBackend(ThumbnailBackend):
+    """Бэкенд sorl-thumbnail, который умеет сохранять AVIF.
+    sorl-thumbnail знает расширения только JPEG, PNG, GIF и WEBP.
+    """
+
+    def _get_thumbnail_filename(self, source, geometry_string, options):
+        if options['format'] != 'AVIF':
+            return super()._get_thumbnail_filename(
+                source, geometry_string, options
+            )
+        name = super()._get_thumbnail_filename(
+            source, geometry_string, {**options, 'format': 'JPEG'}
+        )
+        return f'{name.rsplit(".", 1)[0]}.avif'
+
+    def get_cached_thumbnail(self, file_, geometry_string, **options):
+        """Возвращает уже созданную миниатюру из хранилища ключей
+        sorl-thumbnail или None. В отличие от get_thumbnail() не читает
+        исходник и не создаёт миниатюру.
+        """
+        source = ImageFile(file_)
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+def supported_formats():
+    """Возвращает форматы рендишенов, которые умеет сохранять Pillow.
+    AVIF доступен только с плагином pillow-avif-plugin.
+    """
+    Image.init()
+    return [name for name in RENDITION_FORMATS if name in Image.SAVE]
+
+
+def rendition_options():
+    """Возвращает пары (геометрия, опции) всех рендишенов картинки."""
+    return [
+        (
+            f'{width}x{round(width * RENDITION_RATIO)}',
+            {
+                'format': name,
+                'quality': RENDITION_FORMATS[name]['quality'],
+                'upscale': False,
+            },
+        )
+        for name in supported_formats()
+        for width in RENDITION_WIDTHS
+    ]
+
+
+def _group_renditions(thumbnails):
+    renditions = {}
+    for name, thumbnail in thumbnails:
+        widths = renditions.setdefault(name, {})
+        widths.setdefault(thumbnail.width, thumbnail)
+    return {
+        name: [widths[width] for width in sorted(widths)]
+        for name, widths in renditions.items()
+    }
+
+
+def get_renditions(image):
+    """Возвращает словарь {формат: [миниатюры по возрастанию ширины]}.
+    Картинки не увеличиваются, поэтому у маленьких исходников часть
+    миниатюр совпадает по ширине и выбрасывается.
+    """
+    return _group_renditions(
+        (options['format'], get_thumbnail(image, geometry, **options))
+        for geometry, options in rendition_options()
+    )
+
+
+def get_cached_renditions(image):
+    """Возвращает рендишены картинки, как get_renditions(), если все
+    они уже созданы фоновой задачей, иначе None. Миниатюры только ищутся
+    в хранилище ключей sorl-thumbnail, поэтому запрос страницы не ждёт
+    обработки картинки. Первыми проверяются миниатюры запасного
+    формата: пока их нет, поиск останавливается на первой.
+    """
+    options = rendition_options()
+    fallback = options[-1][1]['format']
+    options.sort(key=lambda option: option[1]['format'] != fallback)
+    thumbnails = []
+    for geometry, rendition in options:
+        thumbnail = default.backend.get_cached_thumbnail(
+            image, geometry, **rendition
+        )
+        if thumbnail is None:
+            return None
+        thumbnails.append((rendition['format'], thumbnail))
+    renditions = _group_renditions(thumbnails)
+    return {name: renditions[name] for name in supported_formats()}
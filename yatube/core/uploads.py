@@ -0,0 +1,178 @@
+import io
+import warnings
+
+from functools import wraps
+
+from django import forms
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from PIL import Image
+
+# Заголовок картинки (с EXIF и профилем ICC) почти всегда укладывается
+# в первые килобайты; дальше данные только копятся, но не разбираются.
+IMAGE_HEADER_MAX_SIZE = 1024 * 1024
+
+
+class RejectedUpload(UploadedFile):
+    """Файл, отклонённый при загрузке. Содержимое не сохраняется,
+    в error записана причина отказа.
+    """
+
+    def __init__(self, name, content_type, size, error):
+        super().__init__(io.BytesIO(), name, content_type, size)
+        self.error = error
+
+
+def _size_error():
+    return (
+        'Размер файла не должен превышать '
+        f'{filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}.'
+    )
+
+
+def _pixels_error(width, height):
+    return (
+        f'Картинка {width}x{height} слишком большая: допускается не более '
+        f'{settings.IMAGE_UPLOAD_MAX_PIXELS:,} пикселей.'.replace(',', ' ')
+    )
+
+
+def _open_header(header):
+    """Возвращает размеры картинки по её началу, не декодируя пиксели.
+    Возвращает None, если данных пока недостаточно.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+        try:
+            with Image.open(io.BytesIO(header)) as image:
+                return image.size
+        except Image.DecompressionBombError as error:
+            raise ValueError(str(error))
+        except Exception:
+            return None
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Проверяет загружаемые картинки по мере поступления данных.
+    Считает байты и читает размеры из заголовка, пока файл ещё
+    принимается. Слишком большой файл, картинка-бомба или не картинка
+    отклоняются сразу: остаток данных не сохраняется, а форма или
+    сериализатор получают RejectedUpload с причиной отказа.
+    Ставится первым обработчиком только в представлениях, которые
+    принимают картинки, см. accept_image_uploads().
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = b''
+        self.dimensions = None
+        self.error = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.error = _size_error()
+            return None
+        if self.dimensions is None:
+            self._check_header(raw_data)
+        return None if self.error else raw_data
+
+    def _check_header(self, raw_data):
+        self.header += raw_data
+        try:
+            self.dimensions = _open_header(self.header)
+        except ValueError:
+            self.error = 'Картинка слишком большая.'
+            return
+        if self.dimensions is None:
+            if len(self.header) > IMAGE_HEADER_MAX_SIZE:
+                self.error = 'Загрузите правильное изображение.'
+            return
+        self.header = b''
+        width, height = self.dimensions
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self.error = _pixels_error(width, height)
+
+    def file_complete(self, file_size):
+        if self.dimensions is None and not self.error and self.received:
+            self.error = 'Загрузите правильное изображение.'
+        if not self.error:
+            # Файл сохранит следующий обработчик из списка.
+            return None
+        return RejectedUpload(
+            self.file_name, self.content_type, self.received, self.error
+        )
+
+
+def accept_image_uploads(request):
+    """Ставит ImageUploadHandler первым обработчиком загрузки запроса
+    request. Вызывается до того, как прочитано тело запроса.
+    """
+    request.upload_handlers.insert(0, ImageUploadHandler(request))
+
+
+def image_uploads(view):
+    """Декоратор представлений с формой загрузки картинок, см.
+    accept_image_uploads(). CsrfViewMiddleware читает request.POST
+    до представления, поэтому CSRF-токен проверяется уже после
+    установки обработчика.
+    """
+    protected_view = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        accept_image_uploads(request)
+        return protected_view(request, *args, **kwargs)
+    return wrapper
+
+
+def validate_image(file):
+    """Проверяет размер файла и число пикселей картинки.
+    Принимает обязательный file: UploadedFile; картинка должна быть
+    уже проверена полем ImageField, которое заполняет file.image.
+    """
+    if file.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        raise forms.ValidationError(_size_error(), code='file_size')
+    width, height = file.image.size
+    if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+        raise forms.ValidationError(
+            _pixels_error(width, height), code='pixels'
+        )
+
+
+def split_rejected_uploads(files):
+    """Возвращает пару (принятые файлы, {поле: причина отказа}).
+    Отклонённый файл убирается из принятых, чтобы форма не передавала
+    его пустое содержимое в Pillow, а показала причину отказа.
+    """
+    rejected = {
+        name: file.error for name, file in (files or {}).items()
+        if isinstance(file, RejectedUpload)
+    }
+    if not rejected:
+        return files, rejected
+    files = files.copy()
+    for name in rejected:
+        del files[name]
+    return files, rejected
+
+
+class BoundedImageField(forms.ImageField):
+    """Поле картинки с ограничением размера файла и числа пикселей.
+    Отказы ImageUploadHandler выводятся как ошибки поля.
+    """
+
+    def to_python(self, data):
+        if isinstance(data, RejectedUpload):
+            raise forms.ValidationError(data.error, code='rejected')
+        file = super().to_python(data)
+        if file is not None:
+            validate_image(file)
+        return file
@@ -1,14 +1,156 @@
+import json
+
+from types import SimpleNamespace
+
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+# Пределы целых чисел, если база не ограничивает поле (SQLite): больше
+# 8 байт не помещается ни в одну базу.
+INTEGER_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+class CursorPaginator(Paginator):
+    """Паджинатор по курсору (keyset-пагинация).
+    Страница выбирается условием по ключу сортировки, а не через
+    OFFSET, поэтому глубокие страницы стоят столько же, сколько первая,
+    и не требуют запроса COUNT(*).
+    Необязательный аргумент ordering: tuple задаёт ключ сортировки,
+    который должен однозначно упорядочивать объекты.
+    По умолчанию равен ('-pub_date', '-id').
+    """
+
+    def __init__(self, object_list, per_page,
+                 ordering=('-pub_date', '-id'), **kwargs):
+        self.ordering = tuple(ordering)
+        super().__init__(object_list.order_by(*ordering), per_page, **kwargs)
+
+    def _fields(self):
+        opts = self.object_list.model._meta
+        return [
+            (opts.get_field(name.lstrip('-')), name.startswith('-'))
+            for name in self.ordering
+        ]
+
+    def encode_cursor(self, obj, reverse=False):
+        """Возвращает курсор, указывающий на позицию объекта obj.
+        Объектом может быть и строка .values() с полями сортировки.
+        """
+        if isinstance(obj, dict):
+            obj = SimpleNamespace(**obj)
+        position = [
+            field.value_to_string(obj) for field, _ in self._fields()
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)})
+        return urlsafe_base64_encode(payload.encode())
+
+    def decode_cursor(self, cursor):
+        """Возвращает пару (позиция, reverse) или None,
+        если курсор повреждён.
+        """
+        try:
+            payload = json.loads(urlsafe_base64_decode(cursor).decode())
+            position = [
+                field.to_python(value)
+                for (field, _), value in zip(self._fields(), payload['p'])
+            ]
+            reverse = bool(payload['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            return None
+        # Пустая позиция дала бы фильтр `поле < None`, а слишком
+        # большое число — ошибку базы.
+        if (
+            len(position) != len(self.ordering)
+            or None in position
+            or not all(map(self._in_range, self._fields(), position))
+        ):
+            return None
+        return position, reverse
+
+    def _in_range(self, field, value):
+        """Помещается ли значение позиции в поле сортировки базы."""
+        field, _ = field
+        if not isinstance(value, int):
+            return True
+        low, high = connections[self.object_list.db].ops.integer_field_range(
+            field.get_internal_type()
+        )
+        low = INTEGER_RANGE[0] if low is None else low
+        high = INTEGER_RANGE[1] if high is None else high
+        return low <= value <= high
+
+    def _seek(self, position, reverse):
+        """Условие `строго после позиции` в порядке сортировки."""
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self._fields(), position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{field.attname}__{lookup}': value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def get_cursor_page(self, cursor=None):
+        """Возвращает страницу, следующую за курсором.
+        Без курсора или с повреждённым курсором возвращает первую
+        страницу. У страницы заполняются атрибуты next_cursor и
+        previous_cursor; None означает, что в эту сторону страниц нет.
+        """
+        decoded = self.decode_cursor(cursor) if cursor else None
+        position, reverse = decoded or (None, False)
+        queryset = self.object_list
+        if reverse:
+            queryset = queryset.reverse()
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if reverse:
+            objects.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        return self._with_cursors(Page(objects, 1, self), has_next,
+                                  has_previous)
+
+    def get_page(self, number):
+        """Возвращает страницу по номеру (OFFSET-пагинация) и
+        заполняет курсоры для перехода к соседним страницам.
+        Оставлен для совместимости со ссылками вида `?page=`.
+        """
+        page = super().get_page(number)
+        page.object_list = list(page.object_list)
+        return self._with_cursors(page, page.has_next(), page.has_previous())
+
+    def _with_cursors(self, page, has_next, has_previous):
+        objects = page.object_list
+        page.next_cursor = (
+            self.encode_cursor(objects[-1]) if objects and has_next else None
+        )
+        page.previous_cursor = (
+            self.encode_cursor(objects[0], reverse=True)
+            if objects and has_previous else None
+        )
+        return page
 
 
-def create_paginator(request, obj_list, per_page=settings.ITEMS_PER_PAGE):
-    """Возвращает паджинатор.
-    Принимает обязательные объект request и список объектов, которые нужно
-    пропаджинировать.
+def create_paginator(request, obj_list, per_page=settings.ITEMS_PER_PAGE,
+                     ordering=('-pub_date', '-id')):
+    """Возвращает страницу паджинатора по курсору.
+    Принимает обязательные объект request и queryset объектов, которые
+    нужно пропаджинировать.
     Необязательный аргумент per_page: int указывает количество объектов не
     странице. По умолчанию равно переменной settings.ITEMS_PER_PAGE.
+    Необязательный аргумент ordering: tuple задаёт ключ сортировки.
+    Страница выбирается по параметру `cursor`; устаревший параметр `page`
+    поддерживается и работает через OFFSET.
     """
-    paginator = Paginator(obj_list, per_page)
+    paginator = CursorPaginator(obj_list, per_page, ordering=ordering)
     page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    if page_number and 'cursor' not in request.GET:
+        return paginator.get_page(page_number)
+    return paginator.get_cursor_page(request.GET.get('cursor'))
@@ -0,0 +1,206 @@
+"""
+Gunicorn configuration for yatube.
+
+Every setting can be overridden with an environment variable, see the
+"Server" section of config/.env.template. Docs:
+http://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import gc
+import math
+import os
+import sys
+import time
+
+_started = time.monotonic()
+
+
+def _env(name, default, cast=str):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    if cast is bool:
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return cast(value)
+
+
+def _cgroup_cpu_limit():
+    """Returns the container CPU quota in CPUs, or None if unlimited."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as quota_file:
+            quota = int(quota_file.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as period_file:
+            period = int(period_file.read())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 else None
+
+
+def available_cpus():
+    """Returns the CPUs this container may use: the affinity mask,
+    capped by the cgroup quota (`docker run --cpus`), at least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def default_workers(worker_class, cpus):
+    """Sync workers wait on the database, so the classic 2 * CPUs + 1
+    is used. Threaded and async workers overlap waits inside a process
+    and need about one process per CPU.
+    """
+    if worker_class == 'sync':
+        return 2 * cpus + 1
+    return cpus + 1
+
+
+def memory_usage(pid='self'):
+    """Returns {'rss', 'pss', 'private'} of a process in bytes.
+    PSS splits pages shared after fork between the processes using
+    them, so the sum of the workers' PSS is what the container needs.
+    """
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as smaps:
+            for line in smaps:
+                name, _, value = line.partition(':')
+                if name in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                    usage[name] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        try:
+            with open(f'/proc/{pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        usage['Rss'] = int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+    return {
+        'rss': usage.get('Rss'),
+        'pss': usage.get('Pss'),
+        'private': (
+            usage['Private_Clean'] + usage['Private_Dirty']
+            if 'Private_Clean' in usage else None
+        ),
+    }
+
+
+def format_memory(usage):
+    return ', '.join(
+        f'{name} {value / 1024 / 1024:.1f} MiB'
+        for name, value in usage.items() if value is not None
+    ) or 'unknown'
+
+
+# === Application ===
+
+# wsgi: yatube.wsgi; asgi: yatube.asgi in uvicorn workers.
+interface = _env('SERVER_INTERFACE', 'wsgi')
+if interface == 'asgi':
+    wsgi_app = 'yatube.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'yatube.wsgi:application'
+    worker_class = _env('GUNICORN_WORKER_CLASS', 'gthread')
+
+chdir = _env('GUNICORN_CHDIR', os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+bind = _env('GUNICORN_BIND', '0.0.0.0:8000')
+
+# === Processes ===
+
+cpus = available_cpus()
+workers = _env('GUNICORN_WORKERS', default_workers(worker_class, cpus), int)
+# Used only by gthread workers: requests served at once by each process.
+threads = _env('GUNICORN_THREADS', 4, int)
+
+# Import Django and the apps once in the master: workers share those
+# pages copy-on-write instead of each importing DRF, drf_yasg and sorl.
+# Code changes then need a full restart, not a HUP.
+preload_app = _env('GUNICORN_PRELOAD', True, bool)
+
+# Recycle workers after a number of requests to bound slow leaks. The
+# jitter keeps workers from restarting at once, and the worker finishes
+# in-flight requests within graceful_timeout.
+max_requests = _env('GUNICORN_MAX_REQUESTS', 2000, int)
+max_requests_jitter = _env(
+    'GUNICORN_MAX_REQUESTS_JITTER', max_requests // 5, int
+)
+graceful_timeout = _env('GUNICORN_GRACEFUL_TIMEOUT', 30, int)
+timeout = _env('GUNICORN_TIMEOUT', 30, int)
+keepalive = _env('GUNICORN_KEEPALIVE', 5, int)
+
+# Heartbeat files on tmpfs: a disk-backed /tmp can block workers.
+worker_tmp_dir = _env('GUNICORN_WORKER_TMP_DIR', '/dev/shm')
+
+# === Logging ===
+
+accesslog = _env('GUNICORN_ACCESSLOG', '-')
+errorlog = _env('GUNICORN_ERRORLOG', '-')
+loglevel = _env('GUNICORN_LOGLEVEL', 'info')
+
+
+# === Hooks: startup and memory report ===
+
+def when_ready(server):
+    if preload_app:
+        # Move the preloaded objects out of the GC generations: collections
+        # in the workers then do not write to their pages and copy them.
+        gc.freeze()
+    server.log.info(
+        'Startup: %s, %s workers x %s, %d CPUs available, preload %s, '
+        'ready in %.2fs, master %s',
+        wsgi_app, workers,
+        f'{threads} threads' if worker_class == 'gthread' else worker_class,
+        cpus, preload_app, time.monotonic() - _started,
+        format_memory(memory_usage()),
+    )
+
+
+def post_fork(server, worker):
+    worker.booted_at = time.monotonic()
+    # Connections opened in the master while preloading must not be
+    # shared between processes.
+    if 'django.db' in sys.modules:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    worker.log.info(
+        'Worker %s booted in %.2fs: %s',
+        worker.pid, time.monotonic() - worker.booted_at,
+        format_memory(memory_usage()),
+    )
+
+
+def worker_exit(server, worker):
+    server.log.info(
+        'Worker %s exiting after %s requests: %s',
+        worker.pid, getattr(worker, 'nr', 'unknown'),
+        format_memory(memory_usage(worker.pid)),
+    )
+    # Pooled database backends (core.db.backends) count waits for a
+    # free connection: waits and timeouts mean the pool is too small.
+    if 'core.db.pool' in sys.modules:
+        from core.db.pool import pool_stats
+        for (alias, _), stats in pool_stats().items():
+            server.log.info(
+                'Worker %s pool %s: %s', worker.pid, alias, ', '.join(
+                    f'{name} {value:g}' for name, value in stats.items()
+                )
+            )
@@ -24,15 +24,7 @@ python /code/yatube/manage.py migrate --noinput
 python /code/yatube/manage.py collectstatic --noinput
 
 # Start gunicorn:
+# Workers, threads, preloading and the ASGI mode (SERVER_INTERFACE=asgi)
+# are set in gunicorn.conf.py and tuned with GUNICORN_* variables.
 # Docs: http://docs.gunicorn.org/en/stable/settings.html
-# Concerning `workers` setting see:
-# https://github.com/wemake-services/wemake-django-template/issues/1022
-/usr/local/bin/gunicorn yatube.wsgi \
-  --workers=4 `# Sync worker settings` \
-  --max-requests=2000 \
-  --max-requests-jitter=400 \
-  --bind='0.0.0.0:8000' `# Run Django on 8000 port` \
-  --chdir='/code/yatube'       `# Locations` \
-  --log-file=- \
-  --access-logfile=- \
-  --worker-tmp-dir='/dev/shm'
+/usr/local/bin/gunicorn --config='/code/yatube/docker/gunicorn.conf.py'
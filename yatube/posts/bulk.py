@@ -0,0 +1,141 @@
+from collections import Counter, defaultdict
+
+from django.db import connections, router, transaction
+
+from .cache import invalidate_follows, invalidate_posts
+from .counters import change_posts_count
+from .feeds import backfill_feeds, fan_out_posts, prune_feeds
+from .models import Follow, Post, User
+from .search import index_posts
+
+
+def _fill_ids(posts, using):
+    """Заполняет id постов после bulk_create там, где база их
+    не возвращает (SQLite). Вызывается в той же транзакции: запись
+    держит блокировку базы, поэтому последние id автора — это
+    только что вставленные посты, в порядке вставки.
+    """
+    posts_by_author = defaultdict(list)
+    for post in posts:
+        if post.id is None:
+            posts_by_author[post.author_id].append(post)
+    for author_id, author_posts in posts_by_author.items():
+        ids = Post.objects.using(using).filter(
+            author_id=author_id
+        ).order_by('-id').values_list('id', flat=True)[:len(author_posts)]
+        for post, post_id in zip(author_posts, reversed(list(ids))):
+            post.id = post_id
+            post._state.adding = False
+            post._state.db = using
+
+
+def create_posts(posts, batch_size=None):
+    """Сохраняет посты одним bulk_create в транзакции и возвращает их.
+    bulk_create не отправляет сигналы, поэтому то, что для одиночного
+    поста делают обработчики post_save, выполняется пакетно: ленты
+    подписчиков, счётчики постов, поисковый индекс и кеш страниц.
+    Принимает обязательный posts: list несохранённых постов и
+    необязательный batch_size: int размер пачки INSERT.
+    """
+    if not posts:
+        return posts
+    using = router.db_for_write(Post)
+    with transaction.atomic(using=using):
+        Post.objects.using(using).bulk_create(posts, batch_size=batch_size)
+        _fill_ids(posts, using)
+        fan_out_posts(posts)
+        for author_id, count in Counter(
+            post.author_id for post in posts
+        ).items():
+            change_posts_count(author_id, count)
+        index_posts([post.id for post in posts])
+    invalidate_posts(posts)
+    return posts
+
+
+def _authors_by_username(usernames):
+    return dict(
+        User.objects.filter(username__in=set(usernames)).values_list(
+            'username', 'id'
+        )
+    )
+
+
+def follow_authors(user, usernames):
+    """Подписывает пользователя user на авторов usernames.
+    Авторы ищутся одним запросом, уже существующие подписки — ещё
+    одним, новые подписки вставляются одним bulk_create. Сигналы
+    post_save при этом не отправляются, поэтому ленты и кеш страниц
+    обновляются здесь же пакетно.
+    Возвращает словарь со списками followed (новые подписки),
+    already_following и словарём errors {username: причина}.
+    """
+    authors = _authors_by_username(usernames)
+    errors = {
+        username: 'Пользователь не найден.'
+        for username in usernames if username not in authors
+    }
+    if user.username in authors:
+        del authors[user.username]
+        errors[user.username] = 'Нельзя подписаться на самого себя!'
+    existing = set(Follow.objects.filter(
+        user=user, author_id__in=authors.values()
+    ).values_list('author_id', flat=True))
+    new = {
+        username: author_id for username, author_id in authors.items()
+        if author_id not in existing
+    }
+    with transaction.atomic():
+        Follow.objects.bulk_create(
+            [Follow(user=user, author_id=author_id)
+             for author_id in new.values()],
+            ignore_conflicts=True
+        )
+        backfill_feeds(user.id, list(new.values()))
+    invalidate_follows(list(new))
+    return {
+        'followed': sorted(new),
+        'already_following': sorted(set(authors) - set(new)),
+        'errors': errors,
+    }
+
+
+def _delete_follows(follow_ids):
+    """Удаляет подписки follow_ids одним DELETE. QuerySet.delete()
+    отправил бы post_delete для каждой подписки: у Follow есть
+    обработчики, поэтому быстрое удаление Django к ней не применяется.
+    """
+    if not follow_ids:
+        return
+    using = router.db_for_write(Follow)
+    placeholders = ', '.join(['%s'] * len(follow_ids))
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {Follow._meta.db_table}'
+            f' WHERE id IN ({placeholders})',
+            follow_ids
+        )
+
+
+def unfollow_authors(user, usernames):
+    """Отписывает пользователя user от авторов usernames.
+    Подписки удаляются одним запросом без сигналов post_delete;
+    ленты и кеш страниц обновляются пакетно.
+    Возвращает словарь со списком unfollowed и словарём errors.
+    """
+    authors = _authors_by_username(usernames)
+    errors = {
+        username: 'Пользователь не найден.'
+        for username in usernames if username not in authors
+    }
+    follows = dict(Follow.objects.filter(
+        user=user, author_id__in=authors.values()
+    ).values_list('id', 'author__username'))
+    removed = set(follows.values())
+    for username in authors.keys() - removed:
+        errors[username] = 'Подписки на пользователя нет.'
+    with transaction.atomic():
+        _delete_follows(list(follows))
+        prune_feeds(user.id, [authors[username] for username in removed])
+    invalidate_follows(list(removed))
+    return {'unfollowed': sorted(removed), 'errors': errors}
@@ -0,0 +1,98 @@
+from core.cache import bump_versions
+
+POSTS_SCOPE = 'posts'
+GROUPS_SCOPE = 'groups'
+COMMENTS_SCOPE = 'comments'
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def index_scopes():
+    """Области данных главной страницы."""
+    return (POSTS_SCOPE,)
+
+
+def group_list_scopes(slug):
+    """Области данных страницы группы."""
+    return (group_scope(slug),)
+
+
+def profile_scopes(username):
+    """Области данных страницы автора."""
+    return (profile_scope(username), GROUPS_SCOPE)
+
+
+def post_detail_scopes(post_id):
+    """Области данных страницы поста. Страница выводит число постов
+    автора, поэтому зависит и от всех постов.
+    """
+    return (post_scope(post_id), POSTS_SCOPE)
+
+
+def _post_scopes(post):
+    scopes = {
+        POSTS_SCOPE,
+        post_scope(post.id),
+        profile_scope(post.author.username),
+    }
+    if post.group_id is not None:
+        scopes.add(group_scope(post.group.slug))
+    return scopes
+
+
+def invalidate_post(post, group_slugs=()):
+    """Сбрасывает страницы, на которых выводится пост.
+    Необязательный аргумент group_slugs: tuple добавляет группы,
+    из которых пост был перенесён.
+    """
+    scopes = _post_scopes(post)
+    scopes.update(group_scope(slug) for slug in group_slugs)
+    bump_versions(*scopes)
+
+
+def invalidate_posts(posts):
+    """Сбрасывает страницы, на которых выводятся посты posts,
+    одной записью версий в кеш.
+    """
+    scopes = set()
+    for post in posts:
+        scopes |= _post_scopes(post)
+    if scopes:
+        bump_versions(*scopes)
+
+
+def invalidate_comment(comment):
+    """Сбрасывает страницу поста, к которому относится комментарий.
+    Область комментариев меняет версию списка постов API, где выводится
+    число комментариев.
+    """
+    bump_versions(post_scope(comment.post_id), COMMENTS_SCOPE)
+
+
+def invalidate_group(group, old_slug=None):
+    """Сбрасывает страницы, на которых выводится группа."""
+    scopes = {POSTS_SCOPE, GROUPS_SCOPE, group_scope(group.slug)}
+    if old_slug:
+        scopes.add(group_scope(old_slug))
+    bump_versions(*scopes)
+
+
+def invalidate_follow(follow):
+    """Сбрасывает страницу автора с кнопкой подписки."""
+    bump_versions(profile_scope(follow.author.username))
+
+
+def invalidate_follows(usernames):
+    """Сбрасывает страницы авторов usernames одной записью в кеш."""
+    if usernames:
+        bump_versions(*(profile_scope(username) for username in usernames))
@@ -0,0 +1,75 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import Profile
+from .models import Comment, Post, User
+
+
+def change_posts_count(author_id, delta):
+    """Изменяет счётчик постов автора на delta.
+    Счётчик не опускается ниже нуля; расхождения исправляет
+    команда recount_counters.
+    """
+    Profile.objects.filter(
+        user_id=author_id, posts_count__gte=-delta
+    ).update(posts_count=F('posts_count') + delta)
+
+
+def change_comments_count(post_id, delta):
+    """Изменяет счётчик комментариев поста на delta.
+    Счётчик не опускается ниже нуля; расхождения исправляет
+    команда recount_counters.
+    """
+    Post.objects.filter(
+        id=post_id, comments_count__gte=-delta
+    ).update(comments_count=F('comments_count') + delta)
+
+
+def _count_of(queryset, field, outer_field='pk'):
+    """Подзапрос с количеством строк queryset, у которых поле field
+    равно полю outer_field внешней строки.
+    """
+    related = queryset.filter(**{field: OuterRef(outer_field)})
+    return Coalesce(
+        Subquery(
+            related.order_by().values(field).annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        0
+    )
+
+
+def recount_posts():
+    """Исправляет расхождения счётчика постов в профилях и возвращает
+    количество исправленных профилей. Создаёт недостающие профили.
+    """
+    Profile.objects.bulk_create(
+        (
+            Profile(user_id=user_id)
+            for user_id in User.objects.filter(
+                profile__isnull=True
+            ).values_list('id', flat=True)
+        ),
+        ignore_conflicts=True
+    )
+    real_count = _count_of(Post.objects.all(), 'author', 'user_id')
+    drifted = Profile.objects.annotate(
+        real_count=real_count
+    ).exclude(posts_count=F('real_count'))
+    return Profile.objects.filter(
+        id__in=list(drifted.values_list('id', flat=True))
+    ).update(posts_count=real_count)
+
+
+def recount_comments():
+    """Исправляет расхождения счётчика комментариев у постов и
+    возвращает количество исправленных постов.
+    """
+    real_count = _count_of(Comment.objects.all(), 'post')
+    drifted = Post.objects.annotate(
+        real_count=real_count
+    ).exclude(comments_count=F('real_count'))
+    return Post.objects.filter(
+        id__in=list(drifted.values_list('id', flat=True))
+    ).update(comments_count=real_count)
@@ -0,0 +1,90 @@
+import datetime
+import json
+
+from .models import Comment, Follow, Post
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Тип записи: (queryset, ((поле в выгрузке, путь в .values()), ...)).
+# Авторы и группы выгружаются по username и slug, чтобы выгрузку можно
+# было загрузить в другую базу.
+EXPORTS = {
+    'post': (Post.objects.all(), (
+        ('id', 'id'),
+        ('author', 'author__username'),
+        ('group', 'group__slug'),
+        ('text', 'text'),
+        ('pub_date', 'pub_date'),
+        ('image', 'image'),
+    )),
+    'comment': (Comment.objects.all(), (
+        ('id', 'id'),
+        ('post', 'post_id'),
+        ('author', 'author__username'),
+        ('text', 'text'),
+        ('created', 'created'),
+    )),
+    'follow': (Follow.objects.all(), (
+        ('id', 'id'),
+        ('user', 'user__username'),
+        ('author', 'author__username'),
+    )),
+}
+
+
+def export_rows(kind, chunk_size=EXPORT_CHUNK_SIZE):
+    """Возвращает генератор словарей записей типа kind по возрастанию id.
+    Строки читаются через .iterator(chunk_size): на PostgreSQL это
+    серверный курсор, поэтому память не зависит от размера таблицы.
+    """
+    queryset, columns = EXPORTS[kind]
+    names = [name for name, _ in columns]
+    lookups = [lookup for _, lookup in columns]
+    rows = queryset.order_by('id').values_list(*lookups).iterator(
+        chunk_size=chunk_size
+    )
+    for values in rows:
+        row = {'type': kind}
+        row.update(zip(names, values))
+        yield row
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    raise TypeError(f'Тип {type(obj).__name__} не сериализуется в JSON')
+
+
+def dumps_line(row):
+    """Возвращает строку NDJSON в байтах для словаря row."""
+    if orjson is not None:
+        return orjson.dumps(
+            row,
+            default=_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+        )
+    return (
+        json.dumps(row, default=_default, ensure_ascii=False) + '\n'
+    ).encode()
+
+
+def export_ndjson(kinds=tuple(EXPORTS), chunk_size=EXPORT_CHUNK_SIZE):
+    """Возвращает генератор NDJSON с записями типов kinds.
+    Каждая строка — объект с ключом type и полями записи. Строки
+    отдаются пачками по chunk_size, чтобы не писать в сокет или файл
+    на каждую запись.
+    """
+    lines = []
+    for kind in kinds:
+        for row in export_rows(kind, chunk_size):
+            lines.append(dumps_line(row))
+            if len(lines) >= chunk_size:
+                yield b''.join(lines)
+                lines = []
+    if lines:
+        yield b''.join(lines)
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+
+from .models import FeedEntry, Follow, Post
+
+
+def _bulk_insert(entries):
+    """Вставляет записи ленты пачками по settings.FEED_BATCH_SIZE,
+    не загружая всю выборку в память. Возвращает количество записей.
+    """
+    total = 0
+    while True:
+        batch = list(islice(entries, settings.FEED_BATCH_SIZE))
+        if not batch:
+            return total
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        total += len(batch)
+
+
+def fan_out_post(post):
+    """Добавляет пост в ленты всех подписчиков его автора.
+    Принимает обязательный аргумент post: Post.
+    """
+    return fan_out_posts([post])
+
+
+def fan_out_posts(posts):
+    """Добавляет посты в ленты подписчиков их авторов.
+    Подписчики всех авторов читаются одним запросом.
+    Принимает обязательный аргумент posts: list сохранённых постов.
+    """
+    posts_by_author = defaultdict(list)
+    for post in posts:
+        posts_by_author[post.author_id].append(post)
+    followers = Follow.objects.filter(
+        author_id__in=posts_by_author
+    ).values_list('user_id', 'author_id')
+    return _bulk_insert(
+        FeedEntry(
+            user_id=user_id,
+            post_id=post.id,
+            author_id=author_id,
+            pub_date=post.pub_date
+        )
+        for user_id, author_id in followers.iterator()
+        for post in posts_by_author[author_id]
+    )
+
+
+def backfill_feed(user_id, author_id):
+    """Добавляет в ленту подписчика все посты автора.
+    Принимает обязательные аргументы user_id: int и author_id: int.
+    """
+    return backfill_feeds(user_id, [author_id])
+
+
+def backfill_feeds(user_id, author_ids):
+    """Добавляет в ленту подписчика все посты авторов author_ids
+    одним запросом к постам.
+    """
+    posts = Post.objects.filter(
+        author_id__in=author_ids
+    ).order_by().values_list('id', 'author_id', 'pub_date')
+    return _bulk_insert(
+        FeedEntry(
+            user_id=user_id,
+            post_id=post_id,
+            author_id=author_id,
+            pub_date=pub_date
+        )
+        for post_id, author_id, pub_date in posts.iterator()
+    )
+
+
+def prune_feed(user_id, author_id):
+    """Убирает из ленты подписчика все посты автора.
+    Принимает обязательные аргументы user_id: int и author_id: int.
+    """
+    prune_feeds(user_id, [author_id])
+
+
+def prune_feeds(user_id, author_ids):
+    """Убирает из ленты подписчика все посты авторов author_ids."""
+    FeedEntry.objects.filter(
+        user_id=user_id, author_id__in=author_ids
+    ).delete()
+
+
+def rebuild_feeds(user_ids=None):
+    """Пересобирает ленты подписок с нуля и возвращает
+    количество созданных записей.
+    Необязательный аргумент user_ids: list ограничивает пересборку
+    лентами заданных пользователей. По умолчанию пересобираются все ленты.
+    """
+    entries = FeedEntry.objects.all()
+    follows = Follow.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+        follows = follows.filter(user_id__in=user_ids)
+    entries.delete()
+    rows = Post.objects.filter(
+        author__following__in=follows
+    ).order_by().values_list(
+        'author__following__user_id', 'id', 'author_id', 'pub_date'
+    )
+    return _bulk_insert(
+        FeedEntry(
+            user_id=user_id,
+            post_id=post_id,
+            author_id=author_id,
+            pub_date=pub_date
+        )
+        for user_id, post_id, author_id, pub_date in rows.iterator()
+    )
@@ -1,5 +1,6 @@
 from django import forms
 
+from core.uploads import split_rejected_uploads, validate_image
 from .models import Comment, Post
 
 
@@ -11,6 +12,18 @@ class PostForm(forms.ModelForm):
         model = Post
         fields = ('text', 'group', 'image', )
 
+    def __init__(self, data=None, files=None, *args, **kwargs):
+        files, self.rejected_uploads = split_rejected_uploads(files)
+        super().__init__(data, files, *args, **kwargs)
+
+    def clean_image(self):
+        image = self.cleaned_data['image']
+        if 'image' in self.rejected_uploads:
+            raise forms.ValidationError(self.rejected_uploads['image'])
+        if image and 'image' in self.files:
+            validate_image(image)
+        return image
+
 
 class CommentForm(forms.ModelForm):
     """Форма создания комментария к посту."""
@@ -0,0 +1,351 @@
+import csv
+import json
+
+from collections import Counter
+from contextlib import contextmanager
+
+from pytils.translit import slugify
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cache import bump_versions
+from .cache import (
+    COMMENTS_SCOPE, GROUPS_SCOPE, POSTS_SCOPE, group_scope, post_scope,
+    profile_scope,
+)
+from .counters import recount_comments, recount_posts
+from .feeds import rebuild_feeds
+from .models import Comment, Follow, Group, Post, User
+from .search import is_supported, rebuild_index
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_BATCH_SIZE = 1000
+
+# Модели типов записей в порядке загрузки внутри пачки: связанные
+# записи раньше ссылающихся на них.
+IMPORT_MODELS = {
+    'user': User,
+    'group': Group,
+    'post': Post,
+    'comment': Comment,
+    'follow': Follow,
+}
+IMPORT_ORDER = tuple(IMPORT_MODELS)
+
+
+class RowError(ValueError):
+    """Ошибка в отдельной записи: запись пропускается, импорт
+    продолжается.
+    """
+
+
+def read_ndjson(stream):
+    """Возвращает генератор записей из потока NDJSON в байтах."""
+    loads = orjson.loads if orjson is not None else json.loads
+    for line in stream:
+        if line.strip():
+            try:
+                yield loads(line)
+            except ValueError as error:
+                yield {'type': None, 'error': f'Некорректный JSON: {error}'}
+
+
+def read_csv(stream, kind):
+    """Возвращает генератор записей типа kind из CSV с заголовком.
+    Принимает обязательные stream: текстовый поток и kind: str,
+    используемый для строк без колонки type.
+    """
+    for row in csv.DictReader(stream):
+        if not row.get('type'):
+            row['type'] = kind
+        yield row
+
+
+@contextmanager
+def _source_dates():
+    """Отключает auto_now и auto_now_add у дат постов и комментариев,
+    чтобы bulk_create сохранил даты из источника. Меняет атрибуты
+    полей модели, поэтому предназначен только для команды импорта.
+    """
+    fields = [
+        Post._meta.get_field('pub_date'),
+        Post._meta.get_field('updated'),
+        Comment._meta.get_field('created'),
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _required(row, name):
+    value = row.get(name)
+    if value in (None, ''):
+        raise RowError(f'Не заполнено поле {name}')
+    return value
+
+
+def _date(row, name):
+    value = row.get(name)
+    if value in (None, ''):
+        return timezone.now()
+    date = parse_datetime(value)
+    if date is None:
+        raise RowError(f'Некорректная дата в поле {name}: {value}')
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date, timezone.utc)
+    return date
+
+
+def _id(row, name='id'):
+    value = row.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'Некорректный id в поле {name}: {value}')
+
+
+class Importer:
+    """Загружает пользователей, группы, посты, комментарии и подписки
+    пачками bulk_create, по транзакции на пачку.
+    Авторы и группы разрешаются по username и slug через словари
+    в памяти: на пачку выполняется не больше одного запроса за
+    недостающими ключами. Записи с id сохраняют его, а уже загруженные
+    записи пропускаются (ignore_conflicts), поэтому повторная загрузка
+    пачки после сбоя не создаёт дублей. processed считает сохранённые
+    записи по типам вместе с пропущенными как уже существующие.
+    Ленты, счётчики и поисковый индекс обновляются один раз в finish(),
+    а не на каждую запись; кеш страниц сбрасывается после каждой пачки.
+    Необязательный kinds: iterable — типы, загруженные прошлыми
+    запусками, если загрузка продолжается после сбоя: finish() учитывает
+    и их.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, kinds=()):
+        self.batch_size = batch_size
+        self.using = router.db_for_write(Post)
+        self.users = {}
+        self.groups = {}
+        self.post_ids = set()
+        self.processed = Counter()
+        self.errors = []
+        # Области страниц пачки и уже сброшенные области запуска.
+        self.pending_scopes = set()
+        self.scopes = set()
+        # Типы, записи которых уже сохранены, в том числе прошлыми
+        # запусками.
+        self.kinds = set(kinds)
+
+    def _resolve(self, table, model, key, values):
+        """Дополняет словарь table: {key: id} недостающими значениями."""
+        missing = {value for value in values if value and value not in table}
+        if missing:
+            table.update(model.objects.using(self.using).filter(
+                **{f'{key}__in': missing}
+            ).values_list(key, 'id'))
+
+    def _lookup(self, table, value, name):
+        if value in (None, ''):
+            return None
+        try:
+            return table[value]
+        except KeyError:
+            raise RowError(f'Не найден объект {name}: {value}')
+
+    def build_user(self, row):
+        return User(
+            username=_required(row, 'username'),
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+            email=row.get('email') or '',
+            password=make_password(None),
+            date_joined=_date(row, 'date_joined'),
+        )
+
+    def build_group(self, row):
+        title = _required(row, 'title')
+        return Group(
+            title=title,
+            slug=row.get('slug') or slugify(title)[:100],
+            description=row.get('description') or '',
+        )
+
+    def build_post(self, row):
+        pub_date = _date(row, 'pub_date')
+        post = Post(
+            id=_id(row),
+            author_id=self._lookup(
+                self.users, _required(row, 'author'), 'author'
+            ),
+            group_id=self._lookup(self.groups, row.get('group'), 'group'),
+            text=_required(row, 'text'),
+            pub_date=pub_date,
+            updated=pub_date,
+            image=row.get('image') or '',
+        )
+        self.pending_scopes.add(profile_scope(row['author']))
+        if row.get('group'):
+            self.pending_scopes.add(group_scope(row['group']))
+        return post
+
+    def build_comment(self, row):
+        post_id = _id(row, 'post')
+        if post_id not in self.post_ids:
+            raise RowError(f'Не найден объект post: {row.get("post")}')
+        self.pending_scopes.add(post_scope(post_id))
+        return Comment(
+            id=_id(row),
+            post_id=post_id,
+            author_id=self._lookup(
+                self.users, _required(row, 'author'), 'author'
+            ),
+            text=_required(row, 'text'),
+            created=_date(row, 'created'),
+        )
+
+    def build_follow(self, row):
+        user_id = self._lookup(self.users, _required(row, 'user'), 'user')
+        author_id = self._lookup(
+            self.users, _required(row, 'author'), 'author'
+        )
+        if user_id == author_id:
+            raise RowError('Нельзя подписаться на самого себя')
+        self.pending_scopes.add(profile_scope(row['author']))
+        return Follow(id=_id(row), user_id=user_id, author_id=author_id)
+
+    def _prepare(self, rows_by_kind):
+        """Загружает в словари пользователей и группы, на которые
+        ссылаются записи пачки.
+        """
+        usernames = [row.get('username') for row in rows_by_kind['user']]
+        for kind, names in (
+            ('post', ('author',)),
+            ('comment', ('author',)),
+            ('follow', ('user', 'author')),
+        ):
+            usernames += [
+                row.get(name) for row in rows_by_kind[kind] for name in names
+            ]
+        self._resolve(self.users, User, 'username', usernames)
+        self._resolve(self.groups, Group, 'slug', [
+            row.get('group') for row in rows_by_kind['post']
+        ])
+
+    def _resolve_posts(self, rows):
+        post_ids = set()
+        for row in rows:
+            try:
+                post_ids.add(_id(row, 'post'))
+            except RowError:
+                pass
+        self.post_ids = set(Post.objects.using(self.using).filter(
+            id__in=post_ids - {None}
+        ).values_list('id', flat=True))
+
+    def import_chunk(self, rows, first_line=1):
+        """Загружает пачку записей одной транзакцией.
+        Записи с ошибками пропускаются и попадают в errors как пары
+        (номер строки, сообщение); first_line — номер первой строки
+        пачки в источнике.
+        """
+        rows_by_kind = {kind: [] for kind in IMPORT_ORDER}
+        for line, row in enumerate(rows, first_line):
+            kind = row.get('type') if isinstance(row, dict) else None
+            if kind not in rows_by_kind:
+                self.errors.append((line, (
+                    isinstance(row, dict) and row.get('error')
+                    or f'Неизвестный тип записи: {kind}'
+                )))
+                continue
+            row['_line'] = line
+            rows_by_kind[kind].append(row)
+        self._prepare(rows_by_kind)
+        with transaction.atomic(using=self.using), _source_dates():
+            for kind in IMPORT_ORDER:
+                if kind == 'comment':
+                    # Посты ищутся после сохранения постов пачки, чтобы
+                    # комментарии могли ссылаться на них.
+                    self._resolve_posts(rows_by_kind[kind])
+                self._save(kind, rows_by_kind[kind])
+        # Сохранённые пачки видны сразу, поэтому страницы сбрасываются
+        # после каждой: сбой до finish() не оставит устаревший кеш.
+        self._bump_scopes(self.pending_scopes)
+        self.scopes |= self.pending_scopes
+        self.pending_scopes = set()
+
+    def _bump_scopes(self, scopes):
+        scopes = list(scopes)
+        for start in range(0, len(scopes), self.batch_size):
+            bump_versions(*scopes[start:start + self.batch_size])
+
+    def _save(self, kind, rows):
+        build = getattr(self, f'build_{kind}')
+        objects = []
+        for row in rows:
+            try:
+                objects.append(build(row))
+            except RowError as error:
+                self.errors.append((row['_line'], str(error)))
+        if not objects:
+            return
+        model = type(objects[0])
+        # Django 2.2 не ограничивает явный batch_size лимитами базы
+        # (число параметров и SELECT в запросе у SQLite).
+        batch_size = min(self.batch_size, max(
+            connections[self.using].ops.bulk_batch_size(
+                model._meta.concrete_fields, objects
+            ), 1
+        ))
+        model.objects.using(self.using).bulk_create(
+            objects, batch_size=batch_size, ignore_conflicts=True
+        )
+        self.processed[kind] += len(objects)
+        self.kinds.add(kind)
+        if kind == 'user':
+            self._resolve(self.users, User, 'username', [
+                obj.username for obj in objects
+            ])
+        elif kind == 'group':
+            self._resolve(self.groups, Group, 'slug', [
+                obj.slug for obj in objects
+            ])
+            self.pending_scopes.add(GROUPS_SCOPE)
+
+    def finish(self):
+        """Обновляет данные, которые bulk_create не поддерживает:
+        последовательности id, профили и счётчики, ленты подписок,
+        поисковый индекс и кеш страниц.
+        Последовательности сбрасываются для всех моделей при каждом
+        запуске: записи с явными id могли загрузить прошлые запуски.
+        """
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            statements = connection.ops.sequence_reset_sql(
+                no_style(), list(IMPORT_MODELS.values())
+            )
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            recount_posts()
+            recount_comments()
+            if self.kinds & {'post', 'follow'}:
+                rebuild_feeds()
+            if self.kinds & {'post', 'comment'}:
+                if is_supported():
+                    rebuild_index()
+        self._bump_scopes([POSTS_SCOPE, COMMENTS_SCOPE, *self.scopes])
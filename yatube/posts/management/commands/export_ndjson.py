@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from posts.export import EXPORT_CHUNK_SIZE, EXPORTS, export_ndjson
+
+
+class Command(BaseCommand):
+    """Выгружает посты, комментарии и подписки в NDJSON."""
+
+    help = (
+        'Выгружает посты, комментарии и подписки в NDJSON, по записи '
+        'на строку. Память не зависит от размера таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            dest='kinds',
+            choices=list(EXPORTS),
+            action='append',
+            help='Тип записей для выгрузки. Можно указать несколько раз, '
+                 'по умолчанию выгружаются все.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за один запрос.'
+        )
+        parser.add_argument(
+            '--output',
+            '-o',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+
+    def handle(self, *args, **options):
+        chunks = export_ndjson(
+            options['kinds'] or list(EXPORTS), options['chunk_size']
+        )
+        if options['output'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
+            return
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(
+            self.style.SUCCESS(f'Выгрузка записана в {options["output"]}')
+        )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import invalidate_post
+from posts.models import Post
+from posts.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    """Создаёт миниатюры для уже загруженных картинок постов."""
+
+    help = 'Создаёт миниатюры всех размеров для картинок постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Сколько постов читать из базы за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        posts = (
+            Post.objects.exclude(image='')
+            .order_by('id')
+            .select_related('author', 'group')
+            .only('id', 'image', 'author__username', 'group__slug')
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        count = 0
+        failed = 0
+        for post in posts:
+            try:
+                generate_thumbnails(post.image)
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f'Пост {post.id}: {error}')
+                continue
+            # Страницы с исходной картинкой строятся заново.
+            invalidate_post(post)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано картинок: {count}, с ошибками: {failed}'
+        ))
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.imports import (
+    IMPORT_BATCH_SIZE, IMPORT_CHUNK_SIZE, IMPORT_ORDER, Importer, read_csv,
+    read_ndjson,
+)
+
+
+class Command(BaseCommand):
+    """Загружает пользователей, группы, посты, комментарии и подписки
+    из NDJSON или CSV.
+    """
+
+    help = (
+        'Загружает записи из NDJSON (по объекту с ключом type на строку, '
+        'как в выгрузке export_ndjson) или CSV с заголовком. Пишет пачками '
+        'bulk_create, после каждой пачки сохраняет позицию в файл '
+        'состояния, с которой загрузку можно продолжить ключом --resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл для загрузки.')
+        parser.add_argument(
+            '--format',
+            choices=('ndjson', 'csv'),
+            help='Формат файла; по умолчанию определяется по расширению.'
+        )
+        parser.add_argument(
+            '--type',
+            dest='kind',
+            choices=IMPORT_ORDER,
+            help='Тип записей CSV-файла без колонки type.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help='Сколько записей загружать одной транзакцией.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Сколько строк вставлять одним INSERT.'
+        )
+        parser.add_argument(
+            '--state',
+            help='Файл состояния; по умолчанию <path>.state.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить загрузку с позиции из файла состояния.'
+        )
+
+    def read_state(self, path, state_path):
+        try:
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+        except FileNotFoundError:
+            return 0, []
+        except ValueError:
+            raise CommandError(f'Повреждён файл состояния {state_path}')
+        if state.get('path') != path:
+            raise CommandError(
+                f'Файл состояния {state_path} относится к {state.get("path")}'
+            )
+        return state['done'], state.get('kinds', [])
+
+    def write_state(self, path, state_path, done, kinds):
+        temp_path = f'{state_path}.tmp'
+        with open(temp_path, 'w') as state_file:
+            json.dump(
+                {'path': path, 'done': done, 'kinds': sorted(kinds)},
+                state_file
+            )
+        os.replace(temp_path, state_path)
+
+    def open_rows(self, path, options):
+        file_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'ndjson'
+        )
+        if file_format == 'ndjson':
+            stream = open(path, 'rb')
+            return stream, read_ndjson(stream)
+        if options['kind'] is None:
+            raise CommandError('Для CSV укажите тип записей ключом --type')
+        stream = open(path, newline='', encoding='utf-8')
+        return stream, read_csv(stream, options['kind'])
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        state_path = options['state'] or f'{path}.state'
+        # Типы, загруженные до сбоя: finish() перестроит ленты и индекс
+        # и для них.
+        done, kinds = (
+            self.read_state(path, state_path)
+            if options['resume'] else (0, [])
+        )
+        importer = Importer(batch_size=options['batch_size'], kinds=kinds)
+        stream, rows = self.open_rows(path, options)
+        started = time.monotonic()
+        loaded = 0
+        with stream:
+            rows = islice(rows, done, None)
+            while True:
+                chunk = list(islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                errors = len(importer.errors)
+                importer.import_chunk(chunk, first_line=done + 1)
+                for line, error in importer.errors[errors:]:
+                    self.stderr.write(f'Запись {line}: {error}')
+                done += len(chunk)
+                loaded += len(chunk)
+                self.write_state(path, state_path, done, importer.kinds)
+                elapsed = time.monotonic() - started
+                self.stderr.write(
+                    f'Обработано записей: {done}, '
+                    f'{loaded / elapsed if elapsed else 0:.0f} в секунду'
+                )
+        importer.finish()
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        processed = ', '.join(
+            f'{kind}: {importer.processed[kind]}' for kind in IMPORT_ORDER
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {processed}; ошибок: {len(importer.errors)}'
+        ))
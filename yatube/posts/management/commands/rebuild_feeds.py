@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.feeds import rebuild_feeds
+
+
+class Command(BaseCommand):
+    """Пересобирает ленты подписок пользователей."""
+
+    help = 'Пересобирает ленты подписок (FeedEntry) по таблице Follow.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            dest='user_ids',
+            type=int,
+            action='append',
+            help='id пользователя, чью ленту нужно пересобрать. '
+                 'Можно указать несколько раз.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = rebuild_feeds(options['user_ids'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Создано записей ленты: {created}')
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.search import is_supported, rebuild_index
+
+
+class Command(BaseCommand):
+    """Заново строит полнотекстовый индекс постов."""
+
+    help = 'Перестраивает поисковый индекс постов и комментариев.'
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            self.stderr.write('База данных не поддерживает поисковый индекс.')
+            return
+        with transaction.atomic():
+            rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.counters import recount_comments, recount_posts
+
+
+class Command(BaseCommand):
+    """Пересчитывает денормализованные счётчики."""
+
+    help = ('Исправляет расхождения счётчиков постов в профилях '
+            'и комментариев у постов.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            profiles = recount_posts()
+            posts = recount_comments()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено профилей: {profiles}, постов: {posts}'
+        ))
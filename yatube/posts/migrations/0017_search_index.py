@@ -0,0 +1,51 @@
+from django.db import migrations
+
+POSTGRES_SCHEMA = (
+    # Без внешнего ключа: иначе flush() в тестах не сможет выполнить
+    # TRUNCATE таблицы постов. Записи удалённых постов убирает сигнал.
+    'CREATE TABLE posts_search ('
+    ' post_id integer PRIMARY KEY,'
+    ' document tsvector NOT NULL)',
+    'CREATE INDEX posts_search_document_idx'
+    ' ON posts_search USING gin (document)',
+    "INSERT INTO posts_search (post_id, document)"
+    " SELECT p.id, setweight(to_tsvector('russian', p.text), 'A')"
+    " || setweight(to_tsvector('russian', COALESCE("
+    "(SELECT string_agg(c.text, ' ') FROM posts_comment c"
+    " WHERE c.post_id = p.id), '')), 'B')"
+    ' FROM posts_post p',
+)
+SQLITE_SCHEMA = (
+    'CREATE VIRTUAL TABLE posts_search USING fts5('
+    " text, comments, tokenize = 'unicode61 remove_diacritics 2')",
+    'INSERT INTO posts_search (rowid, text, comments)'
+    ' SELECT p.id, p.text, COALESCE('
+    "(SELECT group_concat(c.text, ' ') FROM posts_comment c"
+    " WHERE c.post_id = p.id), '') FROM posts_post p",
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    schema = {
+        'postgresql': POSTGRES_SCHEMA,
+        'sqlite': SQLITE_SCHEMA,
+    }.get(vendor, ())
+    for statement in schema:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute('DROP TABLE posts_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_post_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -30,6 +30,17 @@ class Group(models.Model):
         super().save(*args, **kwargs)
 
 
+class PostQuerySet(models.QuerySet):
+    """Набор запросов к постам."""
+
+    def for_listing(self):
+        """Подгружает автора и группу одним запросом вместе с постами,
+        чтобы шаблоны и сериализаторы списков не делали запрос на
+        каждый пост.
+        """
+        return self.select_related('author', 'group')
+
+
 class Post(models.Model):
     """Модель Пост."""
 
@@ -46,6 +57,10 @@ class Post(models.Model):
         auto_now_add=True,
         verbose_name='дата публикации'
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='дата изменения'
+    )
     group = models.ForeignKey(
         Group,
         blank=True,
@@ -61,9 +76,30 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
@@ -100,6 +136,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-created',)
+        indexes = [
+            models.Index(
+                fields=['post', '-created'],
+                name='comment_post_created_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -136,8 +178,81 @@ class Follow(models.Model):
                 check=~models.Q(user=models.F('author')),
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['author', 'user'],
+                name='follow_author_user_idx'
+            ),
+        ]
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
 
     def __str__(self):
         return f'author: {self.author.username} - user: {self.user.username}'
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    """Набор запросов к ленте подписок."""
+
+    def for_listing(self):
+        """Подгружает посты ленты вместе с их авторами и группами."""
+        return self.select_related('post__author', 'post__group')
+
+
+class FeedEntry(models.Model):
+    """Модель записи ленты подписок.
+    Хранит заранее разложенные по подписчикам посты, чтобы лента
+    читалась одним диапазонным проходом по индексу.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed',
+        verbose_name='подписчик',
+        help_text='Владелец ленты'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='пост',
+        help_text='Пост в ленте'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='автор',
+        help_text='Автор поста'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='дата публикации',
+        help_text='Дата публикации поста'
+    )
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('-pub_date', '-post_id')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='unique_feed_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='feed_user_pub_date_idx'
+            ),
+            models.Index(
+                fields=['user', 'author'],
+                name='feed_user_author_idx'
+            ),
+        ]
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+
+    def __str__(self):
+        return f'user: {self.user_id} - post: {self.post_id}'
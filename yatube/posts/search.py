@@ -0,0 +1,164 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+
+from .models import Comment, Post
+
+SEARCH_TABLE = 'posts_search'
+# Вес текста поста выше веса комментариев к нему (для SQLite bm25;
+# в PostgreSQL то же задают веса 'A' и 'B').
+POST_WEIGHT = 2.0
+COMMENTS_WEIGHT = 1.0
+
+WORD_RE = re.compile(r'\w+')
+
+
+def is_supported():
+    """Есть ли у базы полнотекстовый индекс."""
+    return connection.vendor in ('postgresql', 'sqlite')
+
+
+def _comments_sql(aggregate):
+    return (
+        f"COALESCE((SELECT {aggregate} FROM {Comment._meta.db_table} c"
+        " WHERE c.post_id = p.id), '')"
+    )
+
+
+def _where_ids(column, post_ids):
+    if post_ids is None:
+        return '', []
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    return f' WHERE {column} IN ({placeholders})', post_ids
+
+
+def index_posts(post_ids=None):
+    """Обновляет записи индекса постов post_ids одним запросом
+    INSERT ... SELECT. Без post_ids обновляет индекс всех постов.
+    Удалённые посты из индекса не убираются, см. remove_posts().
+    """
+    if not is_supported():
+        return
+    if post_ids is not None:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+    where, params = _where_ids('p.id', post_ids)
+    posts = Post._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            comments = _comments_sql("string_agg(c.text, ' ')")
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (post_id, document)'
+                " SELECT p.id, setweight(to_tsvector('russian', p.text), 'A')"
+                f" || setweight(to_tsvector('russian', {comments}), 'B')"
+                f' FROM {posts} p{where}'
+                ' ON CONFLICT (post_id)'
+                ' DO UPDATE SET document = EXCLUDED.document',
+                params
+            )
+            return
+        remove_posts(post_ids)
+        comments = _comments_sql("group_concat(c.text, ' ')")
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, text, comments)'
+            f' SELECT p.id, p.text, {comments} FROM {posts} p{where}',
+            params
+        )
+
+
+def add_comment(post_id, text):
+    """Дописывает текст нового комментария text в запись индекса поста
+    post_id, не перечитывая остальные комментарии поста.
+    """
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f'UPDATE {SEARCH_TABLE} SET document = document'
+                " || setweight(to_tsvector('russian', %s), 'B')"
+                ' WHERE post_id = %s',
+                [text, post_id]
+            )
+            return
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET comments = comments || ' ' || %s"
+            ' WHERE rowid = %s',
+            [text, post_id]
+        )
+
+
+def remove_posts(post_ids=None):
+    """Убирает посты post_ids из индекса; без post_ids очищает его.
+    У таблицы индекса нет внешнего ключа на посты, поэтому записи
+    удалённых постов убираются явно.
+    """
+    if not is_supported():
+        return
+    if post_ids is not None:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+    column = 'post_id' if connection.vendor == 'postgresql' else 'rowid'
+    where, params = _where_ids(column, post_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}{where}', params)
+
+
+def rebuild_index():
+    """Заново строит индекс всех постов."""
+    remove_posts()
+    index_posts()
+
+
+def search_posts(query, queryset=None):
+    """Возвращает посты, в тексте которых или в комментариях к которым
+    встречаются все слова запроса query. Посты упорядочены по убыванию
+    релевантности rank, затем от новых к старым.
+    Необязательный queryset ограничивает выборку постов.
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    words = WORD_RE.findall(query.lower())
+    if not words:
+        return queryset.none()
+    ordering = ('-rank', '-pub_date', '-id')
+    if connection.vendor == 'postgresql':
+        tsquery = "plainto_tsquery('russian', %s)"
+        return queryset.extra(
+            tables=[SEARCH_TABLE],
+            where=[
+                f'{SEARCH_TABLE}.post_id = {Post._meta.db_table}.id',
+                f'{SEARCH_TABLE}.document @@ {tsquery}',
+            ],
+            params=[' '.join(words)],
+            select={'rank': f'ts_rank({SEARCH_TABLE}.document, {tsquery})'},
+            select_params=[' '.join(words)],
+        ).order_by(*ordering)
+    if connection.vendor == 'sqlite':
+        # В SQLite нет русского стемминга, поэтому слова ищутся
+        # по префиксу. bm25() тем меньше, чем документ релевантнее.
+        return queryset.extra(
+            tables=[SEARCH_TABLE],
+            where=[
+                f'{SEARCH_TABLE}.rowid = {Post._meta.db_table}.id',
+                f'{SEARCH_TABLE} MATCH %s',
+            ],
+            params=[' '.join(f'"{word}"*' for word in words)],
+            select={
+                'rank': f'-bm25({SEARCH_TABLE}, '
+                        f'{POST_WEIGHT}, {COMMENTS_WEIGHT})'
+            },
+        ).order_by(*ordering)
+    condition = Q()
+    for word in words:
+        condition &= (
+            Q(text__icontains=word) | Q(comments__text__icontains=word)
+        )
+    return (
+        queryset.filter(condition)
+        .distinct()
+        .annotate(rank=Value(0.0, output_field=FloatField()))
+        .order_by(*ordering)
+    )
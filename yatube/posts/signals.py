@@ -0,0 +1,169 @@
+import threading
+
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save,
+)
+from django.dispatch import receiver
+
+from .cache import (
+    invalidate_comment, invalidate_follow, invalidate_group, invalidate_post,
+)
+from .counters import change_comments_count, change_posts_count
+from .feeds import backfill_feed, fan_out_post, prune_feed
+from .models import Comment, Follow, Group, Post
+from .search import add_comment, index_posts, remove_posts
+
+# Посты, которые удаляются в текущем потоке: их комментарии удаляются
+# каскадом раньше самого поста, и переиндексировать пост незачем.
+_deleting = threading.local()
+
+
+def _deleting_posts():
+    if not hasattr(_deleting, 'post_ids'):
+        _deleting.post_ids = set()
+    return _deleting.post_ids
+
+
+@receiver(post_save, sender=Post)
+def add_post_to_feeds(sender, instance, created, **kwargs):
+    """Раскладывает новый пост по лентам подписчиков автора."""
+    if created:
+        fan_out_post(instance)
+
+
+@receiver(post_save, sender=Follow)
+def fill_feed_on_follow(sender, instance, created, **kwargs):
+    """Добавляет посты автора в ленту нового подписчика."""
+    if created:
+        backfill_feed(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_feed_on_unfollow(sender, instance, **kwargs):
+    """Убирает посты автора из ленты отписавшегося пользователя."""
+    prune_feed(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def increase_posts_count(sender, instance, created, **kwargs):
+    """Увеличивает счётчик постов автора."""
+    if created:
+        change_posts_count(instance.author_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def decrease_posts_count(sender, instance, **kwargs):
+    """Уменьшает счётчик постов автора."""
+    change_posts_count(instance.author_id, -1)
+
+
+def _sync_cached_post(comment, delta):
+    """Обновляет счётчик у загруженного в память поста комментария,
+    чтобы объект не расходился с базой.
+    """
+    if Comment.post.is_cached(comment):
+        post = comment.post
+        post.comments_count = max(post.comments_count + delta, 0)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comments_count(sender, instance, created, **kwargs):
+    """Увеличивает счётчик комментариев поста."""
+    if created:
+        change_comments_count(instance.post_id, 1)
+        _sync_cached_post(instance, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comments_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста."""
+    change_comments_count(instance.post_id, -1)
+    _sync_cached_post(instance, -1)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    """Запоминает группу, в которой пост был до изменения."""
+    instance._old_group_slugs = tuple(
+        slug for slug in Post.objects.filter(
+            id=instance.id
+        ).values_list('group__slug', flat=True) if slug
+    ) if instance.id else ()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Сбрасывает кеш страниц с изменённым постом."""
+    invalidate_post(
+        instance, instance.__dict__.pop('_old_group_slugs', ())
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """Сбрасывает кеш страницы поста с изменённым комментарием."""
+    invalidate_comment(instance)
+
+
+@receiver(pre_save, sender=Group)
+def remember_group_slug(sender, instance, **kwargs):
+    """Запоминает slug группы до изменения."""
+    instance._old_slug = Group.objects.filter(
+        id=instance.id
+    ).values_list('slug', flat=True).first() if instance.id else None
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_pages(sender, instance, **kwargs):
+    """Сбрасывает кеш страниц с изменённой группой."""
+    invalidate_group(instance, instance.__dict__.pop('_old_slug', None))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_pages(sender, instance, **kwargs):
+    """Сбрасывает кеш страницы автора с кнопкой подписки."""
+    invalidate_follow(instance)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    """Обновляет запись поста в поисковом индексе."""
+    if update_fields is None or 'text' in update_fields:
+        index_posts([instance.id])
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    """Запоминает удаляемый пост до каскадного удаления комментариев."""
+    _deleting_posts().add(instance.id)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    """Убирает удалённый пост из поискового индекса."""
+    _deleting_posts().discard(instance.id)
+    remove_posts([instance.id])
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, created, **kwargs):
+    """Дописывает новый комментарий в запись поста в индексе,
+    а при изменении комментария обновляет запись целиком.
+    """
+    if created:
+        add_comment(instance.post_id, instance.text)
+    else:
+        index_posts([instance.post_id])
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    """Обновляет запись поста с удалённым комментарием в индексе,
+    если сам пост не удаляется вместе с ним.
+    """
+    if instance.post_id not in _deleting_posts():
+        index_posts([instance.post_id])
@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from users.models import Profile
+from ..models import Post
+from .setup_data import (
+    ViewNamePatternURL, create_comment, create_post, create_user,
+)
+
+view_name = ViewNamePatternURL()
+
+
+class CountersTest(TestCase):
+    """Проверяет денормализованные счётчики постов и комментариев."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = create_user(username='Author')
+        cls.post = create_post(author=cls.author)
+
+    def posts_count(self):
+        return Profile.objects.get(user=CountersTest.author).posts_count
+
+    def comments_count(self, post):
+        return Post.objects.get(id=post.id).comments_count
+
+    def test_new_user_gets_profile(self):
+        """Новому пользователю создаётся профиль."""
+        user = create_user(username='Newcomer')
+        self.assertEqual(user.profile.posts_count, 0)
+
+    def test_posts_count_follows_create_and_delete(self):
+        """Счётчик постов меняется при создании и удалении постов."""
+        self.assertEqual(self.posts_count(), 1)
+        self.client.force_login(CountersTest.author)
+        self.client.post(view_name.post_create, data={'text': 'Новый пост'})
+        self.assertEqual(self.posts_count(), 2)
+        Post.objects.filter(author=CountersTest.author).delete()
+        self.assertEqual(self.posts_count(), 0)
+
+    def test_comments_count_follows_create_and_delete(self):
+        """Счётчик комментариев меняется при создании и удалении."""
+        self.client.force_login(CountersTest.author)
+        self.client.post(
+            view_name.add_comment(CountersTest.post.id),
+            data={'text': 'Комментарий'}
+        )
+        comment = create_comment(CountersTest.post, CountersTest.author)
+        self.assertEqual(self.comments_count(CountersTest.post), 2)
+        comment.delete()
+        self.assertEqual(self.comments_count(CountersTest.post), 1)
+
+    def test_pages_show_counters(self):
+        """Страницы profile и post_detail выводят значение счётчика."""
+        Profile.objects.filter(user=CountersTest.author).update(
+            posts_count=42
+        )
+        urls = (
+            view_name.profile(CountersTest.author.username),
+            view_name.post_detail(CountersTest.post.id),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), '42')
+
+    def test_recount_counters_command(self):
+        """Команда recount_counters исправляет расхождения."""
+        create_comment(CountersTest.post, CountersTest.author)
+        Profile.objects.filter(user=CountersTest.author).update(
+            posts_count=10
+        )
+        Post.objects.filter(id=CountersTest.post.id).update(
+            comments_count=5
+        )
+        call_command('recount_counters', stdout=StringIO())
+        self.assertEqual(self.posts_count(), 1)
+        self.assertEqual(self.comments_count(CountersTest.post), 1)
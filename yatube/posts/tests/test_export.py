@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..export import export_ndjson, export_rows
+from .setup_data import (
+    create_comment, create_follow, create_group, create_post, create_user,
+)
+
+
+class ExportTest(TestCase):
+    """Тесты выгрузки в NDJSON."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = create_user(username='Author')
+        cls.follower = create_user(username='Follower')
+        cls.group = create_group(1)
+        cls.posts = [
+            create_post(author=cls.author, group=cls.group, text=f'Пост {n}')
+            for n in range(3)
+        ]
+        cls.comment = create_comment(post=cls.posts[0], author=cls.follower)
+        create_follow(cls.follower, cls.author)
+
+    def read_lines(self, chunks):
+        return [
+            json.loads(line)
+            for line in b''.join(chunks).decode().splitlines()
+        ]
+
+    def test_export_rows(self):
+        """Записи выгружаются по возрастанию id с username и slug."""
+        post = self.posts[0]
+        rows = list(export_rows('post', chunk_size=2))
+        self.assertEqual([row['id'] for row in rows],
+                         [post.id for post in self.posts])
+        self.assertEqual(rows[0], {
+            'type': 'post',
+            'id': post.id,
+            'author': 'Author',
+            'group': self.group.slug,
+            'text': 'Пост 0',
+            'pub_date': post.pub_date,
+            'image': '',
+        })
+
+    def test_export_ndjson(self):
+        """Выгрузка — по объекту JSON на строку, пачками по chunk_size."""
+        chunks = list(export_ndjson(chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        lines = self.read_lines(chunks)
+        self.assertEqual(
+            [line['type'] for line in lines],
+            ['post'] * 3 + ['comment', 'follow']
+        )
+        self.assertEqual(
+            lines[0]['pub_date'], self.posts[0].pub_date.isoformat()
+        )
+        self.assertEqual(lines[3]['post'], self.posts[0].id)
+        self.assertEqual(
+            (lines[4]['user'], lines[4]['author']), ('Follower', 'Author')
+        )
+
+    def test_command(self):
+        """Команда пишет выгрузку в стандартный вывод или в файл."""
+        out = StringIO()
+        call_command('export_ndjson', kinds=['comment'], stdout=out)
+        lines = self.read_lines([out.getvalue().encode()])
+        self.assertEqual([line['id'] for line in lines], [self.comment.id])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.ndjson')
+            call_command('export_ndjson', output=path, stderr=StringIO())
+            with open(path, 'rb') as export:
+                self.assertEqual(len(self.read_lines([export.read()])), 5)
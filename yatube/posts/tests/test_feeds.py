@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import FeedEntry, Follow
+from .setup_data import (
+    ViewNamePatternURL, create_follow, create_post, create_user,
+)
+
+view_name = ViewNamePatternURL()
+
+
+class FeedTest(TestCase):
+    """Проверяет ленту подписок FeedEntry."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = create_user(username='Author')
+        cls.follower = create_user(username='Follower')
+        cls.other_user = create_user(username='Other')
+        cls.old_post = create_post(author=cls.author, text='Старый пост')
+        create_follow(follower=cls.follower, author=cls.author)
+
+    def feed_post_ids(self, user):
+        return list(user.feed.values_list('post_id', flat=True))
+
+    def test_follow_backfills_feed(self):
+        """Подписка добавляет в ленту уже опубликованные посты автора."""
+        self.assertEqual(
+            self.feed_post_ids(FeedTest.follower),
+            [FeedTest.old_post.id]
+        )
+
+    def test_new_post_fans_out_to_followers(self):
+        """Новый пост попадает только в ленты подписчиков автора."""
+        post = create_post(author=FeedTest.author, text='Новый пост')
+        self.assertEqual(self.feed_post_ids(FeedTest.follower)[0], post.id)
+        self.assertFalse(FeedTest.other_user.feed.exists())
+
+    def test_unfollow_prunes_feed(self):
+        """Отписка убирает посты автора из ленты."""
+        self.client.force_login(FeedTest.follower)
+        self.client.get(view_name.profile_unfollow(FeedTest.author.username))
+        self.assertFalse(FeedTest.follower.feed.exists())
+
+    def test_follow_index_reads_feed(self):
+        """Страница follow_index показывает посты из ленты."""
+        self.client.force_login(FeedTest.follower)
+        response = self.client.get(view_name.follow_index)
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            self.feed_post_ids(FeedTest.follower)
+        )
+
+    def test_rebuild_feeds_command(self):
+        """Команда rebuild_feeds восстанавливает ленты по подпискам."""
+        FeedEntry.objects.all().delete()
+        Follow.objects.create(user=FeedTest.other_user, author=FeedTest.author)
+        FeedEntry.objects.filter(user=FeedTest.other_user).delete()
+        call_command('rebuild_feeds', stdout=StringIO())
+        for user in (FeedTest.follower, FeedTest.other_user):
+            with self.subTest(user=user.username):
+                self.assertEqual(
+                    self.feed_post_ids(user),
+                    [FeedTest.old_post.id]
+                )
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import tempfile
+
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from users.models import Profile
+from ..export import export_ndjson
+from ..models import Comment, FeedEntry, Follow, Group, Post, User
+from .setup_data import (
+    create_comment, create_follow, create_group, create_post, create_user,
+)
+
+
+class ImportDataTest(TestCase):
+    """Тесты команды импорта import_data."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        super().tearDown()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def write_ndjson(self, name, rows):
+        return self.write(name, ''.join(
+            json.dumps(row, ensure_ascii=False) + '\n' for row in rows
+        ))
+
+    def call(self, *args, **options):
+        out = StringIO()
+        err = StringIO()
+        call_command('import_data', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_export_round_trip(self):
+        """Выгрузка export_ndjson загружается обратно без потерь."""
+        author = create_user(username='Author')
+        follower = create_user(username='Follower')
+        group = create_group(1)
+        posts = [create_post(author=author, group=group) for _ in range(3)]
+        create_comment(post=posts[0], author=follower)
+        create_follow(follower, author)
+        expected_posts = list(Post.objects.order_by('id').values_list(
+            'id', 'author__username', 'group__slug', 'text', 'pub_date'
+        ))
+        export = b''.join(export_ndjson()).decode()
+        Post.objects.all().delete()
+        Follow.objects.all().delete()
+        path = self.write('export.ndjson', export)
+
+        out, _ = self.call(path, chunk_size=2)
+
+        self.assertIn('post: 3', out)
+        self.assertEqual(list(Post.objects.order_by('id').values_list(
+            'id', 'author__username', 'group__slug', 'text', 'pub_date'
+        )), expected_posts)
+        self.assertEqual(Comment.objects.get().post_id, posts[0].id)
+        self.assertTrue(
+            Follow.objects.filter(user=follower, author=author).exists()
+        )
+        self.assertEqual(FeedEntry.objects.filter(user=follower).count(), 3)
+        self.assertEqual(Profile.objects.get(user=author).posts_count, 3)
+        self.assertEqual(Post.objects.get(id=posts[0].id).comments_count, 1)
+        self.assertEqual(
+            Post.objects.create(author=author, text='Новый').id,
+            posts[-1].id + 1
+        )
+        self.assertFalse(os.path.exists(f'{path}.state'))
+
+    def test_csv_and_lookups(self):
+        """CSV загружается с типом из --type, авторы и группы
+        разрешаются по username и slug.
+        """
+        users = self.write(
+            'users.csv', 'username,first_name\nLev,Лев\nAnna,Анна\n'
+        )
+        self.call(users, kind='user')
+        Group.objects.create(title='Книги', slug='books')
+        posts = self.write(
+            'posts.csv',
+            'author,group,text,pub_date\n'
+            'Lev,books,Война и мир,2020-01-02T03:04:05+00:00\n'
+            'Anna,,Без группы,\n'
+            'Nobody,,Без автора,\n'
+        )
+
+        out, err = self.call(posts, kind='post')
+
+        self.assertIn('post: 2', out)
+        self.assertIn('Запись 3: Не найден объект author: Nobody', err)
+        post = Post.objects.get(text='Война и мир')
+        self.assertEqual(post.author.first_name, 'Лев')
+        self.assertEqual(post.group.slug, 'books')
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertFalse(
+            User.objects.get(username='Lev').has_usable_password()
+        )
+        self.assertTrue(Profile.objects.filter(user__username='Anna').exists())
+
+    def test_resume(self):
+        """С --resume загрузка продолжается с позиции из файла состояния,
+        а повторно загруженные записи с id не дублируются.
+        """
+        author = create_user(username='Author')
+        rows = [
+            {'type': 'post', 'id': 1000 + n, 'author': 'Author',
+             'text': f'Пост {n}'}
+            for n in range(4)
+        ]
+        path = self.write_ndjson('posts.ndjson', rows)
+        Post.objects.create(id=1000, author=author, text='Уже загружен')
+        self.write(
+            'posts.ndjson.state', json.dumps({'path': path, 'done': 1})
+        )
+
+        self.call(path, resume=True)
+
+        self.assertEqual(
+            list(Post.objects.order_by('id').values_list('text', flat=True)),
+            ['Уже загружен', 'Пост 1', 'Пост 2', 'Пост 3']
+        )
+
+        self.call(path)
+        self.assertEqual(Post.objects.count(), 4)
+
+    def test_resume_finishes_earlier_kinds(self):
+        """Продолжение после сбоя на комментариях сбрасывает
+        последовательности всех моделей и перестраивает ленты для постов,
+        загруженных до сбоя.
+        """
+        author = create_user(username='Author')
+        post = create_post(author=author)
+        path = self.write_ndjson('comments.ndjson', [
+            {'type': 'comment', 'post': post.id, 'author': 'Author',
+             'text': 'Комментарий'},
+        ])
+        self.write('comments.ndjson.state', json.dumps(
+            {'path': path, 'done': 0, 'kinds': ['post']}
+        ))
+        with mock.patch(
+            'posts.imports.rebuild_feeds'
+        ) as rebuild_feeds, mock.patch.object(
+            connection.ops, 'sequence_reset_sql', return_value=[]
+        ) as sequence_reset_sql:
+            self.call(path, resume=True)
+        rebuild_feeds.assert_called_once_with()
+        self.assertEqual(
+            set(sequence_reset_sql.call_args.args[1]),
+            {User, Group, Post, Comment, Follow}
+        )
+
+    def test_bad_rows(self):
+        """Ошибочные записи пропускаются с номером записи в отчёте."""
+        create_user(username='Author')
+        path = self.write(
+            'bad.ndjson',
+            '{"type": "post", "author": "Author", "text": "Пост"}\n'
+            '{"type": "post", "author": "Author"}\n'
+            '{"type": "unknown"}\n'
+            '{"type": "follow", "user": "Author", "author": "Author"}\n'
+            'not json\n'
+        )
+
+        out, err = self.call(path)
+
+        self.assertIn('ошибок: 4', out)
+        self.assertIn('Запись 2: Не заполнено поле text', err)
+        self.assertIn('Запись 3: Неизвестный тип записи: unknown', err)
+        self.assertIn('Запись 4: Нельзя подписаться на самого себя', err)
+        self.assertIn('Запись 5: Некорректный JSON', err)
+        self.assertEqual(Post.objects.count(), 1)
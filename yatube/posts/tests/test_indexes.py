@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+
+from ..models import Comment, FeedEntry, Follow, Post
+from .setup_data import (
+    create_comment, create_follow, create_group, create_post, create_user,
+)
+
+LISTING_ORDERING = ('-pub_date', '-id')
+LIMIT = settings.ITEMS_PER_PAGE + 1
+
+
+class ListingIndexesTest(TestCase):
+    """Проверяет по EXPLAIN, что запросы страниц-списков читают
+    данные по индексу и не сортируют выборку отдельно.
+    Проверка выполняется на SQLite и PostgreSQL.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = create_user(username='Author')
+        cls.follower = create_user(username='Follower')
+        cls.group = create_group(1)
+        cls.post = create_post(author=cls.author, group=cls.group)
+        create_comment(post=cls.post, author=cls.follower)
+        create_follow(follower=cls.follower, author=cls.author)
+
+    def setUp(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('EXPLAIN проверяется только для SQLite и '
+                          'PostgreSQL.')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('TEMP B-TREE', plan)
+        else:
+            self.assertNotRegex(plan, r'(?m)^\s*(->\s*)?Sort\b')
+
+    def test_listing_queries_use_indexes(self):
+        """Запросы index, group_list, profile, follow_index и комментариев
+        используют составные индексы.
+        """
+        author = ListingIndexesTest.author
+        querysets = {
+            'post_pub_date_idx': Post.objects.order_by(*LISTING_ORDERING),
+            'post_group_pub_date_idx': Post.objects.filter(
+                group=ListingIndexesTest.group
+            ).order_by(*LISTING_ORDERING),
+            'post_author_pub_date_idx': Post.objects.filter(
+                author=author
+            ).order_by(*LISTING_ORDERING),
+            'comment_post_created_idx': Comment.objects.filter(
+                post=ListingIndexesTest.post
+            ),
+            'feed_user_pub_date_idx': FeedEntry.objects.filter(
+                user=ListingIndexesTest.follower
+            ),
+            'follow_author_user_idx': Follow.objects.filter(
+                author=author
+            ).values_list('user_id', flat=True),
+        }
+        for index_name, queryset in querysets.items():
+            with self.subTest(index=index_name):
+                self.assertUsesIndex(queryset[:LIMIT], index_name)
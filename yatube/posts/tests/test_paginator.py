@@ -1,5 +1,12 @@
+import json
+
+from django.core.cache import cache
 from django.core.paginator import Page, Paginator
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlsafe_base64_encode
 
 from .setup_data import (
     ViewNamePatternURL, create_group, create_user, one_of_thirteen_posts,
@@ -18,6 +25,10 @@ class PaginatorViewsTest(TestCase):
         cls.group = create_group(1)
         one_of_thirteen_posts(author=cls.user, group=cls.group)
 
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
     def test_paginators_view(self):
         """Проверка паджинаторов представлений."""
         reverse_names = {
@@ -44,3 +55,74 @@ class PaginatorViewsTest(TestCase):
             with self.subTest(name=name):
                 response = self.client.get(reverse_name + '?page=2')
                 self.assertEqual(len(response.context['page_obj']), 3)
+
+    def test_cursor_pages_cover_all_records(self):
+        """Переход по курсорам вперёд и назад проходит все посты
+        без повторов и пропусков.
+        """
+        response = self.client.get(view_name.index)
+        first_page = response.context['page_obj']
+        self.assertIsNone(first_page.previous_cursor)
+        self.assertIsNotNone(first_page.next_cursor)
+
+        response = self.client.get(
+            view_name.index, {'cursor': first_page.next_cursor}
+        )
+        second_page = response.context['page_obj']
+        self.assertEqual(len(second_page), 3)
+        self.assertIsNone(second_page.next_cursor)
+        self.assertIsNotNone(second_page.previous_cursor)
+        self.assertFalse(
+            {post.id for post in first_page}
+            & {post.id for post in second_page}
+        )
+
+        response = self.client.get(
+            view_name.index, {'cursor': second_page.previous_cursor}
+        )
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            [post.id for post in first_page]
+        )
+        self.assertIsNone(response.context['page_obj'].previous_cursor)
+
+    def test_cursor_page_does_not_count(self):
+        """Страница по курсору не выполняет запрос COUNT(*)."""
+        response = self.client.get(view_name.index)
+        cursor = response.context['page_obj'].next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                view_name.group_list(PaginatorViewsTest.group.slug),
+                {'cursor': cursor}
+            )
+        self.assertFalse(
+            any('COUNT(' in query['sql'] for query in queries)
+        )
+
+    def test_broken_cursor_returns_first_page(self):
+        """Повреждённый курсор возвращает первую страницу."""
+        response = self.client.get(view_name.index, {'cursor': 'broken'})
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertIsNone(response.context['page_obj'].previous_cursor)
+
+    def test_cursor_without_position_returns_first_page(self):
+        """Курсор с пустой позицией возвращает первую страницу."""
+        cursor = urlsafe_base64_encode(
+            json.dumps({'p': [None, None], 'r': 0}).encode()
+        )
+        response = self.client.get(view_name.index, {'cursor': cursor})
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertIsNone(response.context['page_obj'].previous_cursor)
+        response = self.client.get(reverse('post-list'), {'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+
+    def test_cursor_with_huge_id_returns_first_page(self):
+        """Курсор с id вне диапазона поля возвращает первую страницу."""
+        cursor = urlsafe_base64_encode(json.dumps({
+            'p': ['2020-01-01T00:00:00+00:00', 10 ** 30], 'r': 0,
+        }).encode())
+        response = self.client.get(view_name.index, {'cursor': cursor})
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertIsNone(response.context['page_obj'].previous_cursor)
+        response = self.client.get(reverse('post-list'), {'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from .setup_data import (
+    ViewNamePatternURL, create_comment, create_follow, create_group,
+    create_post, create_user,
+)
+
+view_name = ViewNamePatternURL()
+
+
+class ListingQueriesTest(TestCase):
+    """Проверяет, что число запросов страниц не зависит от
+    количества выводимых постов.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = create_user(username='Reader')
+        cls.group = create_group(1)
+        for number in range(5):
+            author = create_user(username=f'Author{number}')
+            create_follow(follower=cls.reader, author=author)
+            post = create_post(author=author, group=cls.group)
+            create_comment(post=post, author=cls.reader)
+        cls.author = author
+        cls.post = post
+
+    def setUp(self):
+        self.client.force_login(ListingQueriesTest.reader)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def test_pages_make_constant_number_of_queries(self):
+        """Страницы со списками постов и страница поста выполняют
+        фиксированное число запросов: сессия, пользователь и данные
+        страницы без запросов на каждый пост.
+        """
+        pages_queries = {
+            view_name.index: 3,
+            view_name.group_list(ListingQueriesTest.group.slug): 4,
+            view_name.profile(ListingQueriesTest.author.username): 5,
+            view_name.follow_index: 3,
+            view_name.post_detail(ListingQueriesTest.post.id): 4,
+        }
+        for url, queries in pages_queries.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.client.get(url)
@@ -0,0 +1,96 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from ..search import search_posts
+from .setup_data import create_comment, create_post, create_user
+
+
+class SearchTest(TestCase):
+    """Тесты полнотекстового поиска постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+        cls.title_post = create_post(
+            author=cls.user, text='Рецепт: яблочный пирог с корицей'
+        )
+        cls.comment_post = create_post(
+            author=cls.user, text='Что приготовить на ужин?'
+        )
+        create_comment(cls.comment_post, cls.user, text='Испеки пирог')
+        cls.other_post = create_post(author=cls.user, text='Про погоду')
+
+    def test_ranked_results(self):
+        """Совпадение в тексте поста ранжируется выше совпадения
+        в комментарии.
+        """
+        self.assertEqual(
+            list(search_posts('пирог')),
+            [SearchTest.title_post, SearchTest.comment_post]
+        )
+
+    def test_all_words_required(self):
+        """Пост находится, только если встречаются все слова запроса."""
+        self.assertEqual(
+            list(search_posts('пирог корицей')), [SearchTest.title_post]
+        )
+        self.assertFalse(search_posts('пирог погоду').exists())
+        self.assertFalse(search_posts('  ').exists())
+
+    def test_index_updated_on_changes(self):
+        """Индекс обновляется при изменении поста и комментариев
+        и при удалении поста.
+        """
+        post = SearchTest.other_post
+        post.text = 'Про солнечную погоду'
+        post.save()
+        self.assertEqual(list(search_posts('солнечную')), [post])
+
+        comment = create_comment(post, SearchTest.user, text='Ливень')
+        self.assertEqual(list(search_posts('ливень')), [post])
+        comment.delete()
+        self.assertFalse(search_posts('ливень').exists())
+
+        post.delete()
+        self.assertFalse(search_posts('солнечную').exists())
+
+    def test_comments_do_not_reindex_post(self):
+        """Новый комментарий дописывается в индекс без перечитывания
+        остальных, а удаление поста не переиндексирует его ради каждого
+        комментария.
+        """
+        post = create_post(author=SearchTest.user, text='Про рыбалку')
+        with mock.patch('posts.signals.index_posts') as index_posts:
+            create_comment(post, SearchTest.user, text='Клевало')
+            create_comment(post, SearchTest.user, text='Щука')
+            self.assertEqual(list(search_posts('щука клевало')), [post])
+            post.delete()
+        index_posts.assert_not_called()
+        self.assertFalse(search_posts('щука').exists())
+
+    def test_rebuild_command(self):
+        """Команда rebuild_search_index восстанавливает индекс."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM posts_search')
+        self.assertFalse(search_posts('пирог').exists())
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(search_posts('пирог').count(), 2)
+
+    def test_search_page_and_api(self):
+        """Страница поиска и API выдают найденные посты."""
+        response = self.client.get(reverse('posts:search'), {'q': 'пирог'})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [SearchTest.title_post, SearchTest.comment_post]
+        )
+        response = self.client.get(reverse('search-list'), {'q': 'корицей'})
+        self.assertEqual(
+            [post['id'] for post in response.json()],
+            [SearchTest.title_post.id]
+        )
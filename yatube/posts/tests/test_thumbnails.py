@@ -0,0 +1,114 @@
+import shutil
+import tempfile
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.thumbnails import rendition_options
+from ..models import Post
+from .setup_data import (
+    ViewNamePatternURL, create_post, create_user, image_path,
+)
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+view_name = ViewNamePatternURL()
+
+
+def run_on_commit(func):
+    func()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, BACKGROUND_TASKS_SYNC=True)
+@mock.patch('core.tasks.transaction.on_commit', run_on_commit)
+@mock.patch('posts.thumbnails.get_thumbnail')
+class ThumbnailsTest(TestCase):
+    """Тесты фонового создания миниатюр."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = create_user(username='Author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ThumbnailsTest.user)
+
+    def assertThumbnailsGenerated(self, get_thumbnail, post):
+        self.assertEqual(
+            [(c.args[0].name, c.args[1], c.kwargs)
+             for c in get_thumbnail.call_args_list],
+            [(post.image.name, geometry, options)
+             for geometry, options in rendition_options()]
+        )
+
+    def test_post_create_generates_thumbnails(self, get_thumbnail):
+        """Публикация поста с картинкой ставит в очередь создание
+        миниатюр всех размеров.
+        """
+        self.client.post(
+            view_name.post_create,
+            data={'text': 'Пост с картинкой', 'image': image_path('a.gif')}
+        )
+        self.assertThumbnailsGenerated(
+            get_thumbnail, Post.objects.latest('id')
+        )
+
+    def test_post_without_image(self, get_thumbnail):
+        """Для поста без картинки и правки без новой картинки
+        миниатюры не создаются.
+        """
+        self.client.post(view_name.post_create, data={'text': 'Без картинки'})
+        post = create_post(
+            author=ThumbnailsTest.user,
+            image=image_path('b.gif')
+        )
+        self.client.post(
+            view_name.post_edit(post.id),
+            data={'text': 'Новый текст'}
+        )
+        get_thumbnail.assert_not_called()
+
+    def test_api_create_generates_thumbnails(self, get_thumbnail):
+        """Создание поста через API ставит в очередь создание миниатюр."""
+        client = APIClient()
+        client.force_authenticate(ThumbnailsTest.user)
+        client.post(
+            reverse('post-list'),
+            data={'text': 'Пост из API', 'image': image_path('c.gif')}
+        )
+        self.assertThumbnailsGenerated(
+            get_thumbnail, Post.objects.latest('id')
+        )
+
+    def test_generate_thumbnails_command(self, get_thumbnail):
+        """Команда generate_thumbnails создаёт миниатюры
+        для уже загруженных картинок.
+        """
+        post = create_post(
+            author=ThumbnailsTest.user,
+            image=image_path('d.gif')
+        )
+        create_post(author=ThumbnailsTest.user)
+        call_command('generate_thumbnails', stdout=mock.Mock())
+        self.assertThumbnailsGenerated(get_thumbnail, post)
+
+    def test_thumbnails_invalidate_pages(self, get_thumbnail):
+        """После создания миниатюр страницы поста строятся заново,
+        чтобы вместо исходной картинки вывести рендишены.
+        """
+        with mock.patch('posts.thumbnails.invalidate_post') as invalidate:
+            self.client.post(
+                view_name.post_create,
+                data={'text': 'Пост с картинкой', 'image': image_path('e.gif')}
+            )
+        invalidate.assert_called_once_with(Post.objects.latest('id'))
@@ -1,11 +1,15 @@
 import shutil
 import tempfile
+import time
 
 from django.conf import settings
 from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.test import Client, TestCase, override_settings
+from django.utils.http import http_date
 
+from core.cache import bump_versions
+from ..cache import POSTS_SCOPE
 from ..forms import CommentForm, PostForm
 from ..models import Post
 from .setup_data import (
@@ -115,23 +119,137 @@ class PostsViewsTest(TestCase):
                 )
 
     def test_index_page_cache(self):
-        """Контент страницы index кешируется."""
+        """Контент страницы index кешируется до изменения постов."""
         create_post(author=PostsViewsTest.user, text='New text post')
 
         response = self.client.get(view_name.index)
         response_post = response.context.get('page_obj')[0]
         self.assertContains(response, response_post)
 
-        response_post.delete()
+        Post.objects.filter(id=response_post.id).update(text='Changed')
 
         response = self.client.get(view_name.index)
         self.assertContains(response, response_post.text)
 
-        cache.clear()
+        response_post.delete()
 
         response = self.client.get(view_name.index)
         self.assertNotContains(response, response_post.text)
 
+    def test_pages_cache_reset_on_changes(self):
+        """Кеш страниц group_list, profile и post_detail сбрасывается
+        при изменении поста или добавлении комментария.
+        """
+        post = create_post(
+            author=PostsViewsTest.user,
+            group=PostsViewsTest.group
+        )
+        urls = (
+            view_name.group_list(PostsViewsTest.group.slug),
+            view_name.profile(PostsViewsTest.user.username),
+            view_name.post_detail(post.id),
+        )
+        for url in urls:
+            self.client.get(url)
+        post.text = 'Изменённый текст'
+        post.save()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), post.text)
+        create_comment(post, PostsViewsTest.user, text='Свежий комментарий')
+        self.assertContains(
+            self.client.get(view_name.post_detail(post.id)),
+            'Свежий комментарий'
+        )
+
+    def test_post_card_fragment_cache(self):
+        """Карточка поста берётся из кеша фрагментов, пока пост
+        не изменён, даже если страница строится заново.
+        """
+        post = create_post(author=PostsViewsTest.user, text='Карточка')
+        self.assertContains(self.client.get(view_name.index), post.text)
+
+        Post.objects.filter(id=post.id).update(text='Без сохранения')
+        bump_versions(POSTS_SCOPE)
+        response = self.client.get(view_name.index)
+        self.assertContains(response, 'Карточка')
+        self.assertNotContains(response, 'Без сохранения')
+
+        post.text = 'Сохранённый текст'
+        post.save()
+        self.assertContains(self.client.get(view_name.index), post.text)
+
+    def test_pages_conditional_get(self):
+        """Неизменившиеся страницы отдают 304 по ETag и Last-Modified,
+        после изменения поста — снова 200.
+        """
+        post = create_post(
+            author=PostsViewsTest.user,
+            group=PostsViewsTest.group
+        )
+        urls = (
+            view_name.index,
+            view_name.group_list(PostsViewsTest.group.slug),
+            view_name.profile(PostsViewsTest.user.username),
+            view_name.post_detail(post.id),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response['ETag']
+                last_modified = response['Last-Modified']
+                self.assertEqual(
+                    self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+                    304
+                )
+                self.assertEqual(
+                    self.client.get(
+                        url, HTTP_IF_MODIFIED_SINCE=last_modified
+                    ).status_code,
+                    304
+                )
+                self.assertEqual(
+                    self.authorized_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag
+                    ).status_code,
+                    200
+                )
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        post.text = 'Изменённый текст'
+        post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+                    200
+                )
+
+    def test_conditional_get_after_login(self):
+        """После повторного входа того же пользователя страница поста
+        строится заново с новым CSRF-токеном формы комментария,
+        а If-Modified-Since не даёт 304 вошедшему пользователю.
+        """
+        post = create_post(author=PostsViewsTest.user)
+        url = view_name.post_detail(post.id)
+        client = Client()
+        client.force_login(PostsViewsTest.user)
+        client.get(url)
+        response = client.get(url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(
+            client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        self.assertEqual(client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        ).status_code, 200)
+
+        client.logout()
+        client.force_login(PostsViewsTest.user)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
     def test_posts_group_page_show_correct_context(self):
         """Шаблон group_list сформирован с правильным контекстом."""
         group_obj = PostsViewsTest.group
@@ -237,6 +355,9 @@ class PostsViewsTest(TestCase):
         )
         new_post = Post.objects.order_by('-id').first()
         self.assertNotEqual(new_post, last_post_in_db)
+        # Профиль уже закеширован при переходе по редиректу,
+        # а контекст нужен из свежего ответа.
+        cache.clear()
 
         reverse_names = {
             'index': view_name.index,
@@ -0,0 +1,36 @@
+from sorl.thumbnail import get_thumbnail
+
+from core.tasks import enqueue
+from core.thumbnails import rendition_options
+from .cache import invalidate_post
+from .models import Post
+
+
+def generate_thumbnails(image):
+    """Создаёт все рендишены картинки image, которые выводит тег
+    {% picture %}. Уже созданные миниатюры берутся из хранилища
+    sorl-thumbnail.
+    """
+    for geometry, options in rendition_options():
+        get_thumbnail(image, geometry, **options)
+
+
+def generate_post_thumbnails(post_id):
+    """Создаёт миниатюры картинки поста post_id, если она есть, и
+    сбрасывает кеш страниц поста: до этого на них выводилась исходная
+    картинка.
+    """
+    post = Post.objects.select_related('author', 'group').filter(
+        id=post_id
+    ).first()
+    if post is not None and post.image:
+        generate_thumbnails(post.image)
+        invalidate_post(post)
+
+
+def schedule_thumbnails(post):
+    """Ставит создание миниатюр картинки поста в фоновую очередь,
+    чтобы первый просмотр страницы не ждал обработки картинки.
+    """
+    if post.image:
+        enqueue(generate_post_thumbnails, post.id)
@@ -1,33 +1,44 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
 
+from core.cache import versioned_cache_page, versioned_condition
+from core.db.routers import pin_primary
+from core.uploads import image_uploads
 from core.utils import create_paginator
 
+from .cache import (
+    group_list_scopes, index_scopes, post_detail_scopes, profile_scopes,
+)
 from .forms import CommentForm, PostForm
 from .models import Follow, Group, Post
+from .search import search_posts
+from .thumbnails import schedule_thumbnails
 
 User = get_user_model()
 
 
-@cache_page(settings.CACHE_TIMEOUT)
+@versioned_condition(index_scopes)
+@versioned_cache_page(settings.CACHE_TIMEOUT, index_scopes)
 def index(request):
     """Возвращает главныю страницу с постами.
     Принимает обязательный обьект request.
     """
-    posts_list = Post.objects.all()
+    posts_list = Post.objects.for_listing()
     page_obj = create_paginator(request, posts_list)
     return render(request, 'posts/index.html', {'page_obj': page_obj})
 
 
+@versioned_condition(group_list_scopes)
+@versioned_cache_page(settings.CACHE_TIMEOUT, group_list_scopes)
 def group_list(request, slug):
     """Возврашает страницу с постами заданной группы.
     Принимает обязательные обьект request и уникальную строку: slug.
     """
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    posts = group.posts.for_listing()
     page_obj = create_paginator(request, posts)
     return render(request, 'posts/group_list.html', {
         'page_obj': page_obj,
@@ -35,12 +46,17 @@ def group_list(request, slug):
     })
 
 
+@versioned_condition(profile_scopes)
+@versioned_cache_page(settings.CACHE_TIMEOUT, profile_scopes)
 def profile(request, username):
     """Возвращает страницу пользователя.
     Принимает обязательные обьект request и логин пользователя: username.
     """
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
+    author = get_object_or_404(
+        User.objects.select_related('profile'),
+        username=username
+    )
+    posts = author.posts.for_listing()
     page_obj = create_paginator(request, posts)
     if not request.user.is_authenticated:
         return render(request, 'posts/profile.html', {
@@ -55,18 +71,40 @@ def profile(request, username):
     })
 
 
+@versioned_condition(post_detail_scopes)
+@versioned_cache_page(settings.CACHE_TIMEOUT, post_detail_scopes)
 def post_detail(request, post_id):
     """Возвращает страницу поста.
     Принимает обязательные обьект request и id поста: post_id.
     """
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(
+        Post.objects.for_listing().select_related('author__profile'),
+        id=post_id
+    )
+    comments = post.comments.select_related('author')
     form = CommentForm()
     return render(request, 'posts/post_detail.html', {
         'post': post,
+        'comments': comments,
         'form': form
     })
 
 
+def search(request):
+    """Возвращает страницу поиска по постам и комментариям.
+    Принимает обязательный обьект request; строка поиска передаётся
+    в параметре `q`. Результаты упорядочены по релевантности.
+    """
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(query, Post.objects.for_listing())
+    paginator = Paginator(posts, settings.ITEMS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return render(request, 'posts/search.html', {
+        'page_obj': page_obj,
+        'query': query
+    })
+
+
 @login_required
 def add_comment(request, post_id):
     """Обрабатывает форму создания комментария к посту.
@@ -85,6 +123,7 @@ def add_comment(request, post_id):
 
 
 @login_required
+@image_uploads
 def post_create(request):
     """Возвращает страницу с формой для создания нового поста.
     Принимает обязательный обьект request.
@@ -95,10 +134,12 @@ def post_create(request):
     post = form.save(commit=False)
     post.author = request.user
     post.save()
+    schedule_thumbnails(post)
     return redirect('posts:profile', username=request.user.username)
 
 
 @login_required
+@image_uploads
 def post_edit(request, post_id):
     """Возвращает страницу с формой редактирования поста.
     Принимает обязательные обьект request и id поста,
@@ -114,7 +155,9 @@ def post_edit(request, post_id):
     )
     if not form.is_valid():
         return render(request, 'posts/post_create.html', {'form': form})
-    form.save()
+    post = form.save()
+    if 'image' in form.changed_data:
+        schedule_thumbnails(post)
     return redirect('posts:post_detail', post_id=post_id)
 
 
@@ -122,13 +165,20 @@ def post_edit(request, post_id):
 def follow_index(request):
     """Возвращает страницу с постами авторов, на которых подписан
     текущий пользователь. Принимает обязательные обьект request.
+    Посты читаются из заранее собранной ленты FeedEntry.
     """
-    posts = Post.objects.filter(author__following__user=request.user)
-    page_obj = create_paginator(request, posts)
+    feed = request.user.feed.for_listing()
+    page_obj = create_paginator(
+        request,
+        feed,
+        ordering=('-pub_date', '-post_id')
+    )
+    page_obj.object_list = [entry.post for entry in page_obj]
     return render(request, 'posts/follow.html', {'page_obj': page_obj})
 
 
 @login_required
+@pin_primary
 def profile_follow(request, username):
     """Реализует процесс подписки на интересного автора.
     Принимает обязательные обьект request и логин автора: username.
@@ -140,6 +190,7 @@ def profile_follow(request, username):
 
 
 @login_required
+@pin_primary
 def profile_unfollow(request, username):
     """Реализует процес отписки от не интересного автора.
     Принимает обязательные обьект request и логин автора: username.
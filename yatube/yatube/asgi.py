@@ -0,0 +1,24 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+Django 2.2 has no ASGI handler of its own, so the WSGI application runs
+in a thread pool of settings.ASGI_THREADS threads per process, see
+core.asgi.WSGIThreadPoolApplication. Run it with an ASGI server, e.g.:
+
+    gunicorn yatube.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+
+import os
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import WSGIThreadPoolApplication
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+application = WSGIThreadPoolApplication(
+    get_wsgi_application(), max_workers=settings.ASGI_THREADS
+)
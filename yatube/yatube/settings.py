@@ -3,7 +3,7 @@ import os
 from datetime import timedelta
 from pathlib import PurePath
 
-from decouple import AutoConfig
+from decouple import AutoConfig, Csv
 
 BASE_DIR = PurePath(__file__).parent.parent
 
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.db.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +76,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.cache.fragment_cache',
             ],
         },
     },
@@ -82,6 +84,18 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Сколько запросов процесс ASGI (yatube.asgi) выполняет одновременно.
+# У каждого потока своё соединение с базой.
+ASGI_THREADS = config('DJANGO_ASGI_THREADS', cast=int, default=16)
+# Потоки воркера gunicorn gthread (docker/gunicorn.conf.py).
+GUNICORN_THREADS = config('GUNICORN_THREADS', cast=int, default=4)
+# Потоки фоновых задач core.tasks.
+BACKGROUND_WORKERS = config('DJANGO_BACKGROUND_WORKERS', cast=int, default=2)
+# Сколько потоков процесса могут одновременно держать соединение
+# с базой. Пул соединений меньше этого числа заставит запросы ждать
+# и падать с OperationalError, см. core.checks.
+DATABASE_THREADS = max(ASGI_THREADS, GUNICORN_THREADS) + BACKGROUND_WORKERS
+
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
@@ -101,10 +115,44 @@ DATABASES = {
         'CONN_MAX_AGE': config('CONN_MAX_AGE', cast=int, default=60),
         'OPTIONS': {
             'connect_timeout': 10,
-        }
+        },
+        # Только для движков core.db.backends.postgresql и .sqlite3:
+        # ограниченный пул соединений, общий для потоков процесса.
+        'POOL': {
+            'MAX_SIZE': config(
+                'DJANGO_DATABASE_POOL_SIZE', cast=int,
+                default=DATABASE_THREADS
+            ),
+            'TIMEOUT': config(
+                'DJANGO_DATABASE_POOL_TIMEOUT', cast=float, default=5
+            ),
+            'MAX_LIFETIME': config(
+                'DJANGO_DATABASE_POOL_MAX_LIFETIME', cast=float, default=1800
+            ),
+            'CHECK_AFTER': config(
+                'DJANGO_DATABASE_POOL_CHECK_AFTER', cast=float, default=30
+            ),
+        },
     }
 }
 
+# Реплики только для чтения: копии default на других хостах.
+# GET-запросы читают из них, см. core.db.routers.
+DATABASE_REPLICAS = []
+for number, host in enumerate(config(
+    'DJANGO_DATABASE_REPLICA_HOSTS', cast=Csv(), default=''
+), 1):
+    DATABASE_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+# Сколько секунд после записи чтения идут в основную базу: время,
+# за которое реплики гарантированно догоняют её.
+REPLICA_PIN_SECONDS = config('DJANGO_REPLICA_PIN_SECONDS', cast=int, default=5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -124,12 +172,23 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+API_BULK_MAX_ITEMS = 1000
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ReplicaPinJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
@@ -169,6 +228,13 @@ STATIC_ROOT = '/var/www/django/static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = '/var/www/django/media'
 
+IMAGE_UPLOAD_MAX_SIZE = config(
+    'DJANGO_IMAGE_UPLOAD_MAX_SIZE', cast=int, default=5 * 1024 * 1024
+)
+IMAGE_UPLOAD_MAX_PIXELS = config(
+    'DJANGO_IMAGE_UPLOAD_MAX_PIXELS', cast=int, default=25_000_000
+)
+
 
 EMPTY_VALUE_DISPLAY = '-пусто-'
 
@@ -181,10 +247,49 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
-CACHES = {
-    'default': {
+# Cache
+# `locmem` - отдельный кеш в каждом процессе, подходит для разработки;
+# `file` - общий для всех воркеров кеш в файлах, по умолчанию в /dev/shm;
+# `redis` - общий кеш в Redis по адресу REDIS_URL.
+
+CACHE_BACKENDS = {
+    'locmem': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config(
+            'DJANGO_CACHE_LOCATION', default='/dev/shm/yatube_cache'
+        ),
+    },
+    'redis': {
+        'BACKEND': 'core.cache_backends.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+    },
+}
+CACHE_BACKEND = config('DJANGO_CACHE_BACKEND', default='locmem')
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
 }
-CACHE_TIMEOUT = 20
+# Страницы сбрасываются сигналами при изменении данных,
+# поэтому их можно хранить долго. Но locmem у каждого процесса свой,
+# и сигнал не сбрасывает страницы других процессов: с ним страницы
+# и версии областей (core.cache) живут недолго.
+if CACHE_BACKEND == 'locmem':
+    CACHE_TIMEOUT = config('DJANGO_CACHE_TIMEOUT', cast=int, default=20)
+    CACHE_VERSIONS_TIMEOUT = CACHE_TIMEOUT
+else:
+    CACHE_TIMEOUT = config(
+        'DJANGO_CACHE_TIMEOUT', cast=int, default=60 * 60 * 4
+    )
+    CACHE_VERSIONS_TIMEOUT = None
 ITEMS_PER_PAGE = 10
+FEED_BATCH_SIZE = 1000
+
+# Без переменной окружения задачи выполняются сразу: в разработке и
+# тестах фоновые потоки не переживают запрос и временные каталоги.
+BACKGROUND_TASKS_SYNC = config(
+    'DJANGO_BACKGROUND_TASKS_SYNC', cast=bool, default=True
+)
+
+THUMBNAIL_BACKEND = 'core.thumbnails.RenditionBackend'